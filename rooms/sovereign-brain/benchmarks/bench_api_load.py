@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTTP load test for the memory endpoints
+Drives /memory/recall, /memory/store and /memory/store/batch with a fixed
+number of concurrent clients and reports p50/p99 latency and RPS per
+endpoint. Start the API first (docker-compose up api, or uvicorn
+src.api.main:app --port 3001).
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import numpy as np
+import httpx
+
+BENCH_SOURCE = "benchmark_api"
+TOPICS = ["vendor", "booking", "nightlife", "dining", "casino", "show"]
+
+
+def make_content(i):
+    return f"api load memory {i} about {TOPICS[i % len(TOPICS)]} number {i * 7 % 101} on the Strip"
+
+
+def make_request(i, mix):
+    kind = random.choices(list(mix), weights=list(mix.values()))[0]
+    if kind == "recall":
+        return kind, "/memory/recall", {"query": f"{random.choice(TOPICS)} on the Strip", "limit": 10}
+    if kind == "store":
+        return kind, "/memory/store", {"content": make_content(i), "source": BENCH_SOURCE}
+    return kind, "/memory/store/batch", {
+        "items": [{"content": make_content(i * 100 + j), "source": BENCH_SOURCE} for j in range(50)]
+    }
+
+
+async def worker(client, counter, deadline, mix, latencies, errors):
+    while time.perf_counter() < deadline:
+        counter[0] += 1
+        kind, path, body = make_request(counter[0], mix)
+        start = time.perf_counter()
+        try:
+            response = await client.post(path, json=body)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors[kind] = errors.get(kind, 0) + 1
+            continue
+        latencies.setdefault(kind, []).append(time.perf_counter() - start)
+
+
+async def run(args):
+    mix = {"recall": args.recall, "store": args.store, "batch": args.batch}
+    mix = {k: v for k, v in mix.items() if v > 0}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60.0) as client:
+        (await client.get("/health")).raise_for_status()
+
+        latencies, errors, counter = {}, {}, [0]
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            worker(client, counter, deadline, mix, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    print(f"\n📊 API LOAD TEST ({args.concurrency} clients, {elapsed:.1f}s)")
+    total = 0
+    for kind, samples in sorted(latencies.items()):
+        ms = np.array(samples) * 1000
+        total += len(samples)
+        print(f"  {kind:<7} {len(samples):7d} req  {len(samples) / elapsed:8.1f} RPS  "
+              f"p50 {np.percentile(ms, 50):7.1f} ms  p99 {np.percentile(ms, 99):7.1f} ms  "
+              f"errors {errors.get(kind, 0)}")
+    print(f"  total   {total:7d} req  {total / elapsed:8.1f} RPS")
+    print(f"\n🧹 Stored rows use source='{BENCH_SOURCE}'; delete them when done:")
+    print(f"   DELETE FROM memories WHERE source = '{BENCH_SOURCE}';")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:3001")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--recall", type=float, default=0.8, help="share of recall requests")
+    parser.add_argument("--store", type=float, default=0.18, help="share of single stores")
+    parser.add_argument("--batch", type=float, default=0.02, help="share of 50-item batch stores")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
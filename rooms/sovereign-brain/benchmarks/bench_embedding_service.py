@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inline encode() on the event loop vs EmbeddingService
+Measures per-request latency and event loop stall under concurrent load
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sentence_transformers import SentenceTransformer
+from src.memory.embedding_service import EmbeddingService
+
+
+async def loop_lag_probe(stop, interval=0.001):
+    """Record how late the event loop wakes us up"""
+    lags = []
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+    return lags
+
+
+async def run_load(encode, texts, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            await encode(text)
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    probe = asyncio.ensure_future(loop_lag_probe(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = await probe
+    return elapsed, np.array(latencies), np.array(lags or [0.0])
+
+
+def report(name, count, elapsed, latencies, lags):
+    print(f"  {name:<18} {count / elapsed:8.1f} req/s  "
+          f"p50 {np.percentile(latencies, 50) * 1000:7.1f}ms  "
+          f"p99 {np.percentile(latencies, 99) * 1000:7.1f}ms  "
+          f"max loop stall {lags.max() * 1000:7.1f}ms")
+
+
+async def run(count, concurrency):
+    model = SentenceTransformer('all-MiniLM-L6-v2')
+    model.encode("warm up")
+    texts = [f"query {i} about Vegas vendor {i % 97}" for i in range(count)]
+
+    async def inline_encode(text):
+        # What recall()/store_memory() used to do
+        return model.encode(text)
+
+    service = EmbeddingService(model)
+
+    print(f"\n📊 EMBEDDING BENCHMARK ({count} requests, concurrency {concurrency})")
+    report("inline encode", count, *await run_load(inline_encode, texts, concurrency))
+    report("EmbeddingService", count, *await run_load(service.encode, texts, concurrency))
+
+    await service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.count, args.concurrency))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vector-only vs hybrid (lexical + vector) recall on
+identifier-heavy queries
+Stores synthetic vendor/ticket/error-code memories (source=benchmark_hybrid),
+asks for each by identifier, alone and inside a question, and reports
+p50/p99 latency and hit@limit (the memory carrying the identifier is
+returned) per recall mode. Needs the Postgres + Redis from docker-compose;
+runs migrate_lexical_index() first when hybrid is benchmarked.
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory.sovereign_memory import SovereignMemorySystem
+
+BENCH_SOURCE = "benchmark_hybrid"
+VENDORS = ["Bellagio", "Wynn", "Aria", "Venetian", "Caesars", "Mirage", "Luxor", "Palazzo"]
+TOPICS = ["catering", "booking", "nightlife", "dining", "casino", "show"]
+
+
+def make_memories(count):
+    memories = []
+    for i in range(count):
+        vendor = f"{VENDORS[i % len(VENDORS)]}{i:05d}"
+        memories.append({
+            "content": f"Vendor {vendor} opened ticket TCK-{i:06d} for {TOPICS[i % len(TOPICS)]}, "
+                       f"failing with error E{1000 + i * 7 % 9000}",
+            "source": BENCH_SOURCE,
+            "identifier": f"TCK-{i:06d}",
+        })
+    return memories
+
+
+def make_queries(memories, count, rng):
+    queries = []
+    for memory in rng.sample(memories, min(count, len(memories))):
+        identifier = memory["identifier"]
+        queries.append((identifier, identifier))
+        queries.append((f"what is the status of ticket {identifier}?", identifier))
+    return queries
+
+
+async def run(count, queries, limit, modes):
+    system = SovereignMemorySystem()
+    await system.initialize()
+    if "hybrid" in modes:
+        await system.migrate_lexical_index()
+    rng = random.Random(11)
+
+    memories = make_memories(count)
+    print(f"🌱 Storing {count} identifier-heavy memories...")
+    stored = await system.store_memories(
+        [{"content": m["content"], "source": m["source"]} for m in memories],
+        link_related=False
+    )
+    by_content = {m.content: m.id for m in stored}
+    expected_ids = {m["identifier"]: by_content.get(m["content"]) for m in memories}
+
+    query_set = make_queries(memories, queries, rng)
+    await system._embed_many([q for q, _ in query_set])  # time recall, not encoding
+
+    print(f"\n📊 HYBRID RECALL BENCHMARK ({count} memories, {len(query_set)} queries, limit {limit})")
+    for mode in modes:
+        latencies, hits = [], []
+        for query, identifier in query_set:
+            start = time.perf_counter()
+            found = await system.recall(query, limit=limit, threshold=0.0, mode=mode,
+                                        include_embeddings=False)
+            latencies.append(time.perf_counter() - start)
+            hits.append(expected_ids[identifier] in {m.id for m in found})
+        latencies = np.array(latencies) * 1000
+        print(f"  {mode:<10} p50 {np.percentile(latencies, 50):8.2f}ms  "
+              f"p99 {np.percentile(latencies, 99):8.2f}ms  hit@{limit} {np.mean(hits):.3f}")
+
+    async with system.db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM memories WHERE source = $1", BENCH_SOURCE)
+    await system.recall_cache.bump_generation()
+    await system.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100, help="identifiers asked about (x2 phrasings)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", default=["filter", "two_stage", "hybrid"])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.count, args.queries, args.limit, args.modes))
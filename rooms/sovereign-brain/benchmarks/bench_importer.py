@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming ChatGPT import throughput and peak RSS
+Writes a synthetic conversations.json (1M messages by default), then
+streams it into Redis (or parses only with --parse-only). Needs Redis
+from docker-compose unless --parse-only is given.
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from universal_importer import DedupIndex, UniversalMemoryImporter, iter_chatgpt_messages, iter_json_array
+
+BENCH_PREFIX = "bench-"
+BENCH_DEDUP_KEY = "dedup:bench"
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def write_export(path, messages, per_conversation):
+    """Stream a ChatGPT-shaped export to disk one conversation at a time"""
+    topics = ["vendor", "booking", "nightlife", "dining", "casino", "show"]
+    with open(path, 'w') as f:
+        f.write("[")
+        for c in range(0, messages, per_conversation):
+            mapping = {}
+            for i in range(c, min(c + per_conversation, messages)):
+                mapping[f"n{i}"] = {
+                    "id": f"n{i}",
+                    "message": {
+                        "id": f"m{i}",
+                        "author": {"role": "user" if i % 2 == 0 else "assistant"},
+                        "create_time": 1700000000.0 + i,
+                        "content": {
+                            "content_type": "text",
+                            "parts": [f"message {i} about {topics[i % len(topics)]} on the Strip"],
+                        },
+                    },
+                    "parent": f"n{i - 1}" if i > c else None,
+                    "children": [],
+                }
+            if c:
+                f.write(",")
+            json.dump({"id": f"{BENCH_PREFIX}{c}", "title": f"Conversation {c}", "mapping": mapping}, f)
+        f.write("]")
+
+
+async def cleanup(importer):
+    # SCAN + pipelined DEL instead of KEYS
+    deleted = 0
+    batch = []
+    for key in importer.r.scan_iter(match=f"memory:chatgpt:{BENCH_PREFIX}*", count=1000):
+        batch.append(key)
+        if len(batch) >= 1000:
+            deleted += importer.r.delete(*batch)
+            batch = []
+    if batch:
+        deleted += importer.r.delete(*batch)
+    importer.r.delete(BENCH_DEDUP_KEY)
+    return deleted
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "conversations.json"
+        start = time.perf_counter()
+        write_export(path, args.messages, args.per_conversation)
+        size_mb = path.stat().st_size / 1e6
+        print(f"📝 Wrote {args.messages} messages ({size_mb:.0f} MB) in {time.perf_counter() - start:.1f}s")
+        baseline = peak_rss_mb()
+
+        start = time.perf_counter()
+        if args.parse_only:
+            count = sum(1 for _ in iter_chatgpt_messages(iter_json_array(path)))
+        else:
+            # Synthetic messages are near-duplicates of each other by design,
+            # so the MinHash stage only runs when asked for
+            importer = UniversalMemoryImporter(
+                near_threshold=args.near_threshold,
+                near_snapshot=str(Path(tmp) / "import_minhash.npz")
+            )
+            importer.dedup = DedupIndex(importer.r, key=BENCH_DEDUP_KEY)
+            count = await importer.import_chatgpt_stream(path, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n📊 STREAMING IMPORT ({count} messages)")
+        print(f"  elapsed      : {elapsed:8.1f}s")
+        print(f"  throughput   : {count / elapsed:10.0f} messages/sec  ({size_mb / elapsed:.1f} MB/s)")
+        print(f"  peak RSS     : {peak_rss_mb():8.0f} MB  (baseline {baseline:.0f} MB)")
+
+        if not args.parse_only:
+            print(f"🧹 Removed {await cleanup(importer)} benchmark keys")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--per-conversation", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--parse-only", action="store_true", help="measure parsing without Redis")
+    parser.add_argument("--near-threshold", type=float, default=None,
+                        help="enable MinHash near-duplicate checks at this Jaccard threshold")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
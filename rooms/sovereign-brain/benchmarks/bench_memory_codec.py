@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes per cache entry and encode/decode time, pickle vs codec
+No services needed
+"""
+
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory.sovereign_memory import Memory
+from src.memory.codec import encode_memory, decode_memory_fields
+
+
+def make_memories(count):
+    rng = np.random.default_rng(0)
+    return [
+        Memory(
+            id=f"{i:016x}",
+            content=f"Vendor {i} on the Strip offers nightlife packages and dinner reservations",
+            embedding=rng.normal(size=384).astype(np.float32),
+            metadata={'vendor_id': i, 'category': 'nightlife', 'tags': ['vegas', 'vip']},
+            source="firebase",
+            timestamp=datetime.now(timezone.utc),
+            feedback_score=0.3,
+            access_count=i % 17,
+            last_accessed=datetime.now(timezone.utc),
+            corrections=[],
+            related_memories=[f"{i + 1:016x}", f"{i + 2:016x}"]
+        )
+        for i in range(count)
+    ]
+
+
+def measure(name, memories, encode, decode):
+    start = time.perf_counter()
+    blobs = [encode(m) for m in memories]
+    encode_us = (time.perf_counter() - start) / len(memories) * 1e6
+
+    start = time.perf_counter()
+    for blob in blobs:
+        decode(blob)
+    decode_us = (time.perf_counter() - start) / len(memories) * 1e6
+
+    size = np.mean([len(b) for b in blobs])
+    print(f"  {name:<14} {size:8.0f} bytes/entry  "
+          f"encode {encode_us:7.1f}µs  decode {decode_us:7.1f}µs")
+
+
+def run(count):
+    memories = make_memories(count)
+    print(f"\n📊 MEMORY CODEC BENCHMARK ({count} entries, 384-dim)")
+    measure("pickle", memories, pickle.dumps, pickle.loads)
+    for dtype in ("float32", "float16", "int8"):
+        measure(f"codec {dtype}", memories,
+                lambda m, d=dtype: encode_memory(m, d),
+                lambda b: Memory(**decode_memory_fields(b)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.count)
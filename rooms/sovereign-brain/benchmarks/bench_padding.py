@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: padding ratio and training tokens/sec per padding mode
+Reads examples from the local training data store (./data/training) or
+falls back to synthetic "### Knowledge:" snippets. Pass --model to also
+time forward/backward passes for each mode.
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM, DataCollatorForLanguageModeling
+from src.learning.dataset_store import TrainingDataStore
+from src.learning.packing import PackedSequenceCollator, pack_dataset_rows, padding_stats
+
+MODES = ("max_length", "bucket", "pack")
+
+
+def load_texts(count):
+    frame = TrainingDataStore("./data/training").load()
+    if len(frame):
+        return [f"### Knowledge: {c}" for c in frame['content'].head(count)]
+    rng = np.random.default_rng(0)
+    words = "vendor booking suite casino show dinner strip vip table club".split()
+    return [
+        "### Knowledge: " + " ".join(rng.choice(words, size=int(rng.integers(5, 120))))
+        for _ in range(count)
+    ]
+
+
+def batches(mode, input_ids, batch_size, max_length, tokenizer):
+    if mode == "pack":
+        packed = pack_dataset_rows(input_ids, max_length)
+        rows = [{'input_ids': i, 'segment_lengths': s}
+                for i, s in zip(packed['input_ids'], packed['segment_lengths'])]
+        collate = PackedSequenceCollator(tokenizer.pad_token_id, dtype=torch.float32)
+    else:
+        if mode == "bucket":
+            input_ids = sorted(input_ids, key=len)
+        rows = [{'input_ids': ids} for ids in input_ids]
+        collate = DataCollatorForLanguageModeling(
+            tokenizer=tokenizer,
+            mlm=False,
+            pad_to_multiple_of=max_length if mode == "max_length" else None
+        )
+    for start in range(0, len(rows), batch_size):
+        yield collate(rows[start:start + batch_size])
+
+
+def run(args):
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    tokenizer.pad_token = tokenizer.eos_token
+    texts = load_texts(args.count)
+    input_ids = tokenizer(texts, truncation=True, max_length=args.max_length)['input_ids']
+    lengths = [len(ids) for ids in input_ids]
+
+    print(f"\n📊 PADDING BENCHMARK ({len(texts)} examples, batch {args.batch_size})")
+    for mode in ("max_length", "dynamic", "bucket", "pack"):
+        stats = padding_stats(lengths, args.batch_size, mode, args.max_length)
+        print(f"  {mode:<11} padded tokens {stats['padded_tokens']:10d}  "
+              f"padding ratio {stats['padding_ratio']:6.1%}")
+
+    if not args.model:
+        return
+
+    model = AutoModelForCausalLM.from_pretrained(args.model)
+    model.train()
+    real = sum(lengths)
+    print(f"\n⚡ Forward/backward throughput with {args.model}")
+    for mode in MODES:
+        start = time.perf_counter()
+        for batch in batches(mode, input_ids, args.batch_size, args.max_length, tokenizer):
+            model(**batch).loss.backward()
+            model.zero_grad(set_to_none=True)
+        elapsed = time.perf_counter() - start
+        print(f"  {mode:<11} {real / elapsed:10.0f} real tokens/sec  ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", default="meta-llama/Llama-2-7b-hf")
+    parser.add_argument("--model", default=None, help="small causal LM to time, e.g. a tiny Llama")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--max-length", type=int, default=512)
+    args = parser.parse_args()
+
+    run(args)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial recall() vs batched recall_many()
+Reports queries/sec per batch size against the live memories table.
+Every query text is unique, so neither the embedding nor the recall
+cache can serve it. Needs the Postgres + Redis from docker-compose.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory.sovereign_memory import SovereignMemorySystem
+
+TOPICS = ["vendor", "booking", "nightlife", "dining", "casino", "show"]
+
+
+def make_queries(count, tag):
+    return [f"{tag} {i} what about {TOPICS[i % len(TOPICS)]} on the Strip" for i in range(count)]
+
+
+async def run(batch_sizes, rounds, limit, threshold):
+    system = SovereignMemorySystem()
+    await system.initialize()
+    await system.embedding_service.encode("warm up")
+
+    print(f"\n📊 RECALL_MANY BENCHMARK (limit {limit}, {rounds} rounds per size)")
+    for size in batch_sizes:
+        queries = make_queries(size * rounds, f"serial-{size}-{time.time()}")
+        start = time.perf_counter()
+        for query in queries:
+            await system.recall(query, limit=limit, threshold=threshold)
+        serial = len(queries) / (time.perf_counter() - start)
+
+        queries = make_queries(size * rounds, f"batch-{size}-{time.time()}")
+        start = time.perf_counter()
+        for i in range(0, len(queries), size):
+            await system.recall_many(queries[i:i + size], limit=limit, threshold=threshold)
+        batched = len(queries) / (time.perf_counter() - start)
+
+        print(f"  batch {size:4d}: recall {serial:8.1f} q/s   "
+              f"recall_many {batched:8.1f} q/s   speedup {batched / serial:5.1f}x")
+
+    await system.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.batch_sizes, args.rounds, args.limit, args.threshold))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-item store_memory() vs batched store_memories()
+Also times both paths with linking deferred to the background linker.
+Needs the Postgres + Redis from docker-compose running locally
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory.sovereign_memory import SovereignMemorySystem
+
+BENCH_SOURCE = "benchmark_store"
+
+
+def make_items(count, tag):
+    """Synthetic memories with a bit of vocabulary overlap"""
+    topics = ["vendor", "booking", "nightlife", "dining", "casino", "show"]
+    return [
+        {
+            'content': f"{tag} memory {i} about {topics[i % len(topics)]} "
+                       f"number {i * 7 % 101} on the Strip",
+            'source': BENCH_SOURCE,
+            'metadata': {'bench': tag, 'i': i}
+        }
+        for i in range(count)
+    ]
+
+
+async def run(count, batch_size):
+    system = SovereignMemorySystem()
+    await system.initialize()
+
+    # Warm up the model so the first encode isn't counted
+    system.embedder.encode("warm up")
+
+    # Per-item path
+    items = make_items(count, "single")
+    start = time.perf_counter()
+    for item in items:
+        await system.store_memory(item['content'], item['source'], item['metadata'])
+    single_elapsed = time.perf_counter() - start
+
+    # Batched path
+    items = make_items(count, "batch")
+    start = time.perf_counter()
+    await system.store_memories(items, batch_size=batch_size)
+    batch_elapsed = time.perf_counter() - start
+
+    # Same paths with linking deferred
+    items = make_items(count, "single_deferred")
+    start = time.perf_counter()
+    for item in items:
+        await system.store_memory(item['content'], item['source'], item['metadata'],
+                                  defer_linking=True)
+    deferred_single_elapsed = time.perf_counter() - start
+
+    items = make_items(count, "batch_deferred")
+    start = time.perf_counter()
+    await system.store_memories(items, batch_size=batch_size, defer_linking=True)
+    deferred_batch_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await system.linker.stop()
+    drain_elapsed = time.perf_counter() - start
+
+    print(f"\n📊 STORE BENCHMARK ({count} memories)")
+    print(f"  store_memory    : {single_elapsed:8.2f}s  {count / single_elapsed:10.1f} memories/sec")
+    print(f"  store_memories  : {batch_elapsed:8.2f}s  {count / batch_elapsed:10.1f} memories/sec")
+    print(f"  speedup         : {single_elapsed / batch_elapsed:8.1f}x")
+    print(f"  store_memory    (deferred links): {deferred_single_elapsed:8.2f}s  "
+          f"{count / deferred_single_elapsed:10.1f} memories/sec")
+    print(f"  store_memories  (deferred links): {deferred_batch_elapsed:8.2f}s  "
+          f"{count / deferred_batch_elapsed:10.1f} memories/sec")
+    print(f"  background link drain           : {drain_elapsed:8.2f}s")
+
+    # Clean up benchmark rows
+    async with system.db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM memories WHERE source = $1", BENCH_SOURCE)
+    await system.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.count, args.batch_size))
@@ -1,14 +1,97 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
 from datetime import datetime
-import redis
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+import asyncpg
+import redis.asyncio as redis
 import os
 
-app = FastAPI(title="EXPREZZZO Sovereign Brain")
+# Importing the module loads the embedding model once per worker process
+from src.memory.sovereign_memory import memory_system
 
-try:
-    r = redis.Redis(host='redis', port=6379, decode_responses=True)
-except:
-    r = redis.Redis(host='localhost', port=6379, decode_responses=True)
+r = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One asyncpg pool + Redis client shared by every request in this worker
+    await memory_system.initialize()
+    await memory_system.embedding_service.encode("warm up")
+    yield
+    await memory_system.close()
+    await r.close()
+
+app = FastAPI(title="EXPREZZZO Sovereign Brain", lifespan=lifespan)
+
+class StoreRequest(BaseModel):
+    content: str
+    source: str = "api"
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class BatchStoreRequest(BaseModel):
+    items: List[StoreRequest] = Field(..., max_length=10000)
+    defer_linking: bool = True
+
+class RecallRequest(BaseModel):
+    query: str
+    limit: int = Field(10, ge=1, le=100)
+    threshold: float = 0.5
+    mode: str = "filter"
+
+class FeedbackRequest(BaseModel):
+    memory_id: str
+    feedback_type: Literal["positive", "negative", "correction"]
+    feedback_value: Any = None
+
+    @model_validator(mode="after")
+    def check_correction(self):
+        if self.feedback_type == "correction" and not isinstance(self.feedback_value, dict):
+            raise ValueError("correction feedback_value must be an object "
+                             "(e.g. {\"corrected_content\": \"...\"})")
+        return self
+
+def _memory_out(memory):
+    """Public view of a Memory (embeddings stay server-side)"""
+    return {
+        "id": memory.id,
+        "content": memory.content,
+        "metadata": memory.metadata,
+        "source": memory.source,
+        "timestamp": memory.timestamp.isoformat() if memory.timestamp else None,
+        "feedback_score": memory.feedback_score,
+        "access_count": memory.access_count,
+        "related_memories": memory.related_memories or [],
+    }
+
+# Sorted set of memory keys scored by store time, for time-ordered paging
+MEMORY_INDEX = "memories:by_time"
+
+def _text(value):
+    """Decode a Redis value; None for binary entries (memory system cache)"""
+    if value is None:
+        return None
+    try:
+        return value.decode()
+    except UnicodeDecodeError:
+        return None
+
+async def _index(memories):
+    """Text copy + timeline entry, so /memory/list and /memory/timeline see API writes"""
+    async with r.pipeline(transaction=False) as pipe:
+        for i, memory in enumerate(memories):
+            key = f"memory:api:{memory.id}"
+            pipe.set(key, memory.content)
+            # A batch shares one timestamp; 1µs steps keep its scores distinct
+            pipe.zadd(MEMORY_INDEX, {key: memory.timestamp.timestamp() + i * 1e-6})
+        await pipe.execute()
+
+async def _load(keys):
+    values = await r.mget(keys) if keys else []
+    return [
+        {"key": key.decode(), "content": content}
+        for key, content in zip(keys, map(_text, values))
+        if content is not None
+    ]
 
 @app.get("/")
 async def root():
@@ -24,29 +107,109 @@ async def root():
 @app.get("/health")
 async def health():
     try:
-        r.ping()
+        await r.ping()
         redis_status = "healthy"
     except:
         redis_status = "error"
-    
+
+    try:
+        async with memory_system.db_pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+        postgres_status = "healthy"
+    except:
+        postgres_status = "error"
+
     return {
         "status": "healthy",
-        "redis": redis_status
+        "redis": redis_status,
+        "postgres": postgres_status
     }
 
 @app.post("/memory/store")
-async def store_memory(content: str):
-    key = f"memory:{datetime.now().timestamp()}"
-    r.set(key, content)
-    return {"status": "stored", "key": key}
+async def store_memory(request: Optional[StoreRequest] = None, content: Optional[str] = None):
+    """Store one memory from a JSON body, or from ?content= as before"""
+    if request is None:
+        if content is None:
+            raise HTTPException(status_code=422, detail="Send a JSON body or ?content=")
+        request = StoreRequest(content=content)
+    memory = await memory_system.store_memory(request.content, request.source, request.metadata)
+    await _index([memory])
+    return {"status": "stored", "key": f"memory:api:{memory.id}", "memory": _memory_out(memory)}
+
+@app.post("/memory/store/batch")
+async def store_memories(request: BatchStoreRequest):
+    memories = await memory_system.store_memories(
+        [item.model_dump() for item in request.items],
+        defer_linking=request.defer_linking
+    )
+    await _index(memories)
+    return {"status": "stored", "count": len(memories), "ids": [m.id for m in memories]}
+
+@app.post("/memory/recall")
+async def recall(request: RecallRequest):
+    try:
+        memories = await memory_system.recall(
+            request.query, limit=request.limit, threshold=request.threshold, mode=request.mode,
+            include_embeddings=False
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"memories": [_memory_out(m) for m in memories]}
+
+@app.post("/memory/feedback")
+async def feedback(request: FeedbackRequest):
+    try:
+        await memory_system.learn_from_feedback(
+            request.memory_id, request.feedback_type, request.feedback_value
+        )
+    except asyncpg.ForeignKeyViolationError:
+        raise HTTPException(status_code=404, detail=f"Unknown memory: {request.memory_id}")
+    return {"status": "learned", "memory_id": request.memory_id}
 
 @app.get("/memory/list")
-async def list_memories():
-    keys = r.keys("memory:*")
-    memories = []
-    for key in keys:
-        memories.append({
-            "key": key,
-            "content": r.get(key)
-        })
-    return {"memories": memories}
+async def list_memories(cursor: int = 0, limit: int = Query(100, ge=1, le=1000)):
+    """Page through memory:* with SCAN; pass next_cursor back until it is null
+
+    SCAN only promises roughly `limit` keys per page, and a key can show
+    up twice if the keyspace is resized mid-walk.
+    """
+    keys = []
+    while True:
+        cursor, page = await r.scan(cursor, match="memory:*", count=limit)
+        keys.extend(page)
+        if cursor == 0 or len(keys) >= limit:
+            break
+    return {
+        "memories": await _load(keys),
+        "next_cursor": cursor or None
+    }
+
+@app.get("/memory/timeline")
+async def memory_timeline(before: Optional[float] = None,
+                          before_key: Optional[str] = None,
+                          limit: int = Query(100, ge=1, le=1000)):
+    """Newest-first page of indexed memories stored before `before` (a timestamp)
+
+    Served from the sorted-set index in O(log N + limit); pass next_before
+    and next_key back for the next page. Entries sharing a score come in
+    reverse key order, so the key breaks ties: the bound is inclusive and
+    entries at `before` are skipped up to and including `before_key`.
+    """
+    upper = before if before is not None else "+inf"
+    seen = 0
+    if before is not None and before_key is not None:
+        seen = await r.zcount(MEMORY_INDEX, before, before)
+    entries = await r.zrevrangebyscore(MEMORY_INDEX, upper, "-inf",
+                                       start=0, num=limit + seen, withscores=True)
+    if before_key is not None:
+        last = before_key.encode()
+        entries = [(key, score) for key, score in entries
+                   if score != before or key < last]
+    entries = entries[:limit]
+    memories = await _load([key for key, _ in entries])
+    more = len(entries) == limit
+    return {
+        "memories": memories,
+        "next_before": entries[-1][1] if more else None,
+        "next_key": entries[-1][0].decode() if more else None
+    }
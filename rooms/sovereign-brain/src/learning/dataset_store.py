@@ -0,0 +1,190 @@
+"""
+EXPREZZZO Training Data Store
+On-disk, append-only snapshot of memories for incremental training cycles
+"""
+
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+_SCHEMA = pa.schema([
+    ('memory_id', pa.string()),
+    ('content', pa.string()),
+    ('source', pa.string()),
+    ('feedback_score', pa.float64()),
+    ('access_count', pa.int64()),
+    ('corrections', pa.string()),  # JSONB text as stored in Postgres
+    ('updated_at', pa.timestamp('us', tz='UTC')),
+])
+
+
+class TrainingDataStore:
+    """
+    Keeps a local copy of the memories table as Parquet delta files
+
+    sync() pulls only rows whose updated_at is newer than the stored
+    watermark and appends them as a new delta; load() collapses the deltas
+    to the latest version of each memory. Source and score filters are
+    applied at load time, so one store serves every collect call.
+
+    Scores are the decayed effective score as of each memory's last sync.
+    Lazy decay and access counting do not touch updated_at, and deletes
+    leave no row to sync, so reconcile() re-reads id, score and
+    access_count for every live memory and drops deleted ones. sync()
+    runs it whenever it compacts (every max_deltas syncs), which bounds
+    how stale the store gets; call it directly after bulk deletes.
+    """
+
+    def __init__(self,
+                 path: str = "./data/training",
+                 batch_size: int = 5000,
+                 overlap: timedelta = timedelta(minutes=5),
+                 max_deltas: int = 50):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.overlap = overlap  # Re-read window for rows committed late
+        self.max_deltas = max_deltas
+        self.state_path = self.path / "state.json"
+
+    def _state(self) -> Dict:
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {'watermark': None, 'deltas': []}
+
+    def _save_state(self, state: Dict):
+        tmp_path = self.state_path.with_name("state.json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(self.state_path)
+
+    async def sync(self, conn) -> int:
+        """Append rows changed since the last sync; returns rows fetched"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        state = self._state()
+
+        query = """
+            SELECT id AS memory_id, content, source,
+                   memory_effective_score(feedback_score, last_accessed, decay_anchor)
+                       AS feedback_score,
+                   access_count, corrections::text AS corrections, updated_at
+            FROM memories
+        """
+        params = []
+        if state['watermark']:
+            query += " WHERE updated_at > $1"
+            params.append(datetime.fromisoformat(state['watermark']) - self.overlap)
+        query += " ORDER BY updated_at"
+
+        delta_name = f"delta-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+        tmp_path = self.path / (delta_name + ".tmp")
+        writer = None
+        fetched = 0
+        watermark = state['watermark']
+
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(query, *params)
+            while True:
+                rows = await cursor.fetch(self.batch_size)
+                if not rows:
+                    break
+                table = pa.Table.from_pylist([dict(r) for r in rows], schema=_SCHEMA)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, _SCHEMA)
+                writer.write_table(table)
+                fetched += len(rows)
+                watermark = rows[-1]['updated_at'].isoformat()
+
+        if writer is None:
+            return 0
+
+        writer.close()
+        tmp_path.replace(self.path / delta_name)
+        state['deltas'].append(delta_name)
+        state['watermark'] = watermark
+        self._save_state(state)
+
+        if len(state['deltas']) > self.max_deltas:
+            await self.reconcile(conn)
+
+        return fetched
+
+    async def reconcile(self, conn) -> int:
+        """Drop deleted memories and refresh scores, then compact; returns rows dropped"""
+        ids, scores, access = [], [], []
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor("""
+                SELECT id,
+                       memory_effective_score(feedback_score, last_accessed, decay_anchor)
+                           AS feedback_score,
+                       access_count
+                FROM memories
+            """)
+            while True:
+                rows = await cursor.fetch(self.batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    ids.append(row['id'])
+                    scores.append(row['feedback_score'])
+                    access.append(row['access_count'])
+        live = pd.DataFrame({'memory_id': ids, 'feedback_score': scores, 'access_count': access})
+        return self.compact(live)
+
+    def load(self,
+             min_score: float = 0.0,
+             sources: Optional[List[str]] = None) -> pd.DataFrame:
+        """Latest version of every memory, filtered and ordered for training"""
+        state = self._state()
+        if not state['deltas']:
+            return pd.DataFrame(columns=_SCHEMA.names)
+
+        frame = self._latest(state['deltas'])
+        frame = frame[frame['feedback_score'] >= min_score]
+        if sources:
+            frame = frame[frame['source'].isin(sources)]
+        return frame.sort_values(
+            ['feedback_score', 'access_count'], ascending=False
+        )
+
+    def _latest(self, deltas: List[str]) -> pd.DataFrame:
+        tables = [pq.read_table(self.path / name, schema=_SCHEMA) for name in deltas]
+        frame = pa.concat_tables(tables).to_pandas()
+        frame = frame.sort_values('updated_at', kind='stable')
+        return frame.drop_duplicates('memory_id', keep='last')
+
+    def compact(self, live: Optional[pd.DataFrame] = None) -> int:
+        """Fold all deltas into a single base file
+
+        With `live` (memory_id, feedback_score, access_count of every row
+        in memories, see reconcile) deleted memories are dropped and the
+        counters refreshed. Returns the number of rows dropped.
+        """
+        state = self._state()
+        if not state['deltas'] or (live is None and len(state['deltas']) <= 1):
+            return 0
+
+        frame = self._latest(state['deltas'])
+        dropped = 0
+        if live is not None:
+            before = len(frame)
+            frame = frame.drop(columns=['feedback_score', 'access_count']).merge(
+                live, on='memory_id', how='inner'
+            )[_SCHEMA.names]
+            dropped = before - len(frame)
+        base_name = f"base-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+        tmp_path = self.path / (base_name + ".tmp")
+        pq.write_table(pa.Table.from_pandas(frame, schema=_SCHEMA, preserve_index=False), tmp_path)
+        tmp_path.replace(self.path / base_name)
+
+        old = state['deltas']
+        state['deltas'] = [base_name]
+        self._save_state(state)
+        for name in old:
+            (self.path / name).unlink(missing_ok=True)
+        return dropped
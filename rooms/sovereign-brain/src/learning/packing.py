@@ -0,0 +1,156 @@
+"""
+EXPREZZZO Sequence Packing
+Length bucketing, sequence packing and padding statistics for training
+"""
+
+import numpy as np
+import torch
+import transformers
+from typing import Dict, List, Sequence
+
+# Earlier releases (4.38-4.41 for Llama) re-invert custom 4D masks, which
+# would mask every in-segment token of the pre-inverted mask built below
+MIN_TRANSFORMERS_VERSION = (4, 42)
+
+
+def pack_lengths(lengths: Sequence[int], max_length: int = 512) -> List[List[int]]:
+    """
+    Best-fit-decreasing bin packing of example indices into sequences
+
+    Returns a list of bins, each a list of example indices whose lengths
+    sum to at most max_length. Open bins are indexed by free space, so each
+    placement costs at most max_length probes regardless of bin count.
+    """
+    order = np.argsort(-np.asarray(lengths), kind='stable')
+    bins: List[List[int]] = []
+    by_space: List[List[int]] = [[] for _ in range(max_length + 1)]
+    for index in order:
+        length = max(1, min(int(lengths[index]), max_length))
+        for free in range(length, max_length + 1):
+            if by_space[free]:
+                b = by_space[free].pop()
+                break
+        else:
+            b = len(bins)
+            bins.append([])
+            free = max_length
+        bins[b].append(int(index))
+        by_space[free - length].append(b)
+    return bins
+
+
+def pack_dataset_rows(input_ids: List[List[int]], max_length: int = 512) -> Dict[str, List]:
+    """Concatenate tokenized examples into packed rows plus their segment lengths"""
+    packed = {'input_ids': [], 'segment_lengths': [], 'length': []}
+    for bin_indices in pack_lengths([len(ids) for ids in input_ids], max_length):
+        row, segments = [], []
+        for index in bin_indices:
+            ids = input_ids[index][:max_length]
+            row.extend(ids)
+            segments.append(len(ids))
+        packed['input_ids'].append(row)
+        packed['segment_lengths'].append(segments)
+        packed['length'].append(len(row))
+    return packed
+
+
+class PackedSequenceCollator:
+    """
+    Batches packed rows while keeping each example isolated
+
+    Builds block-diagonal causal attention (in the inverted 4D form that
+    transformers' decoder models accept as a custom mask), restarts
+    position_ids at every segment, and masks the label of each segment's
+    first token so nothing is predicted across an example boundary.
+    """
+
+    def __init__(self, pad_token_id: int, dtype: torch.dtype = torch.float16):
+        installed = tuple(int(part) for part in transformers.__version__.split('.')[:2])
+        if installed < MIN_TRANSFORMERS_VERSION:
+            raise RuntimeError(
+                f"PackedSequenceCollator needs transformers >= "
+                f"{'.'.join(map(str, MIN_TRANSFORMERS_VERSION))} (found {transformers.__version__}); "
+                f"use padding_mode='bucket' or upgrade"
+            )
+        self.pad_token_id = pad_token_id
+        self.dtype = dtype
+
+    def __call__(self, features: List[Dict]) -> Dict[str, torch.Tensor]:
+        width = max(len(f['input_ids']) for f in features)
+        batch = len(features)
+        minimum = torch.finfo(self.dtype).min
+
+        input_ids = torch.full((batch, width), self.pad_token_id, dtype=torch.long)
+        labels = torch.full((batch, width), -100, dtype=torch.long)
+        position_ids = torch.zeros((batch, width), dtype=torch.long)
+        attention_mask = torch.full((batch, 1, width, width), minimum, dtype=self.dtype)
+
+        for row, feature in enumerate(features):
+            ids = torch.tensor(feature['input_ids'], dtype=torch.long)
+            input_ids[row, :len(ids)] = ids
+            labels[row, :len(ids)] = ids
+
+            start = 0
+            for length in feature['segment_lengths']:
+                if length == 0:
+                    continue
+                end = start + length
+                position_ids[row, start:end] = torch.arange(length)
+                causal = torch.tril(torch.ones(length, length, dtype=torch.bool))
+                attention_mask[row, 0, start:end, start:end].masked_fill_(causal, 0.0)
+                labels[row, start] = -100
+                start = end
+
+            # Padding rows attend to themselves so softmax stays finite
+            for pad in range(start, width):
+                attention_mask[row, 0, pad, pad] = 0.0
+
+        return {
+            'input_ids': input_ids,
+            'labels': labels,
+            'position_ids': position_ids,
+            'attention_mask': attention_mask,
+        }
+
+
+def padding_stats(lengths: Sequence[int],
+                  batch_size: int,
+                  mode: str,
+                  max_length: int = 512) -> Dict[str, float]:
+    """
+    Real vs padded token counts for one epoch under a batching mode
+
+    mode is "max_length" (pad everything to max_length), "dynamic"
+    (pad to the longest example of each shuffled batch), "bucket"
+    (dynamic padding over length-sorted batches) or "pack".
+    """
+    lengths = np.minimum(np.asarray(lengths, dtype=np.int64), max_length)
+    real = int(lengths.sum())
+
+    if mode == "max_length":
+        padded = len(lengths) * max_length
+    elif mode == "pack":
+        bins = pack_lengths(lengths, max_length)
+        bin_lengths = np.array([lengths[b].sum() for b in bins])
+        padded = _dynamic_padded(np.sort(bin_lengths), batch_size)
+    elif mode == "bucket":
+        padded = _dynamic_padded(np.sort(lengths), batch_size)
+    elif mode == "dynamic":
+        shuffled = np.random.default_rng(0).permutation(lengths)
+        padded = _dynamic_padded(shuffled, batch_size)
+    else:
+        raise ValueError(f"Unknown padding mode: {mode}")
+
+    return {
+        'real_tokens': real,
+        'padded_tokens': int(padded),
+        'padding_ratio': 1.0 - real / padded if padded else 0.0,
+    }
+
+
+def _dynamic_padded(lengths: np.ndarray, batch_size: int) -> int:
+    total = 0
+    for start in range(0, len(lengths), batch_size):
+        chunk = lengths[start:start + batch_size]
+        total += int(chunk.max()) * len(chunk)
+    return total
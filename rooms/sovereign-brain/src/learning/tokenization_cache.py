@@ -0,0 +1,109 @@
+"""
+EXPREZZZO Tokenization Cache
+Parallel tokenization with a persistent per-example token cache
+"""
+
+import os
+import sqlite3
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import List, Optional
+from datasets import Dataset
+from datasets.fingerprint import Hasher
+
+
+class TokenizationCache:
+    """
+    Tokenizes only texts it has not seen before
+
+    Token ids are stored in SQLite keyed by sha256(text), one database per
+    tokenizer fingerprint + max_length, so changing either starts a fresh
+    cache instead of serving stale ids. Misses are tokenized with
+    Dataset.map across `num_proc` worker processes.
+    """
+
+    def __init__(self,
+                 tokenizer,
+                 path: str = "./data/training/tokens",
+                 num_proc: Optional[int] = None):
+        self.tokenizer = tokenizer
+        self.path = Path(path)
+        self.num_proc = num_proc or max(1, (os.cpu_count() or 2) // 2)
+        self.fingerprint = Hasher.hash(tokenizer)
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self, max_length: int) -> sqlite3.Connection:
+        self.path.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path / f"{self.fingerprint}-{max_length}.sqlite")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tokens (
+                hash TEXT PRIMARY KEY,
+                input_ids BLOB NOT NULL
+            )
+        """)
+        return conn
+
+    def tokenize(self, texts: List[str], max_length: int = 512) -> List[List[int]]:
+        """Unpadded, truncated input_ids for every text, in input order"""
+        hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        found = {}
+
+        conn = self._connect(max_length)
+        try:
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), 900):  # SQLite variable limit
+                chunk = unique[start:start + 900]
+                rows = conn.execute(
+                    f"SELECT hash, input_ids FROM tokens WHERE hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.int32).tolist()
+
+            missing = {}
+            for key, text in zip(hashes, texts):
+                if key not in found and key not in missing:
+                    missing[key] = text
+            self.hits += len(unique) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                tokenized = self._tokenize_parallel(list(missing.values()), max_length)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO tokens (hash, input_ids) VALUES (?, ?)",
+                    (
+                        (key, np.asarray(ids, dtype=np.int32).tobytes())
+                        for key, ids in zip(missing, tokenized)
+                    )
+                )
+                conn.commit()
+                found.update(zip(missing, tokenized))
+        finally:
+            conn.close()
+
+        print(f"🔤 Tokenized {len(missing)} new texts, {len(unique) - len(missing)} from cache")
+        return [found[key] for key in hashes]
+
+    def _tokenize_parallel(self, texts: List[str], max_length: int) -> List[List[int]]:
+        tokenizer = self.tokenizer
+
+        def tokenize_function(examples):
+            return {
+                'input_ids': tokenizer(
+                    examples['text'],
+                    truncation=True,
+                    max_length=max_length
+                )['input_ids']
+            }
+
+        dataset = Dataset.from_dict({'text': texts})
+        num_proc = self.num_proc if len(texts) >= 1000 * self.num_proc else None
+        return dataset.map(
+            tokenize_function,
+            batched=True,
+            num_proc=num_proc,
+            remove_columns=['text'],
+            load_from_cache_file=False,
+        )['input_ids']
@@ -23,6 +23,9 @@ from peft import LoraConfig, get_peft_model, TaskType
 from datasets import Dataset
 import asyncpg
 from src.memory.sovereign_memory import SovereignMemorySystem
+from src.learning.dataset_store import TrainingDataStore
+from src.learning.tokenization_cache import TokenizationCache
+from src.learning.packing import PackedSequenceCollator, pack_dataset_rows, padding_stats
 
 class TrainingEngine:
     """
@@ -37,6 +40,9 @@ class TrainingEngine:
         self.feedback_data = []
         self.model_path = "./models/finetuned"
         self.checkpoint_path = "./models/checkpoints"
+        self.data_store = TrainingDataStore("./data/training")
+        self.dataset_stats = {}
+        self.token_cache = None  # Created with the tokenizer in load_base_model
         
     async def initialize(self):
         """Initialize the training system"""
@@ -55,6 +61,7 @@ class TrainingEngine:
         
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.token_cache = TokenizationCache(self.tokenizer, "./data/training/tokens")
         
         # Load with 8-bit quantization for efficiency
         self.model = AutoModelForCausalLM.from_pretrained(
@@ -80,35 +87,54 @@ class TrainingEngine:
     
     async def collect_training_data(self,
                                   sources: List[str] = None,
-                                  min_score: float = 0.0) -> List[Dict]:
-        """Collect training data from memories"""
-        
-        async with self.memory_system.db_pool.acquire() as conn:
-            query = """
-                SELECT content, metadata, source, feedback_score, corrections
-                FROM memories
-                WHERE feedback_score >= $1
-            """
-            
-            params = [min_score]
-            
-            if sources:
-                query += " AND source = ANY($2)"
-                params.append(sources)
-            
-            query += " ORDER BY feedback_score DESC, access_count DESC"
-            
-            results = await conn.fetch(query, *params)
+                                  min_score: float = 0.0,
+                                  incremental: bool = True) -> List[Dict]:
+        """Collect training data from memories
+        
+        With incremental=True only memories changed since the last cycle are
+        read from Postgres; the rest comes from the local data store.
+        """
+        
+        if incremental:
+            async with self.memory_system.db_pool.acquire() as conn:
+                changed = await self.data_store.sync(conn)
+            print(f"🔄 Synced {changed} changed memories")
+            results = self.data_store.load(min_score, sources).to_dict('records')
+        else:
+            async with self.memory_system.db_pool.acquire() as conn:
+                query = """
+                    SELECT * FROM (
+                        SELECT content, metadata, source, corrections, access_count,
+                               memory_effective_score(
+                                   feedback_score, last_accessed, decay_anchor
+                               ) AS feedback_score
+                        FROM memories
+                    ) m
+                    WHERE feedback_score >= $1
+                """
+                
+                params = [min_score]
+                
+                if sources:
+                    query += " AND source = ANY($2)"
+                    params.append(sources)
+                
+                query += " ORDER BY feedback_score DESC, access_count DESC"
+                
+                results = await conn.fetch(query, *params)
         
         training_data = []
         
         for row in results:
             # Create training example
             content = row['content']
+            corrections = row['corrections']
+            if isinstance(corrections, str):
+                corrections = json.loads(corrections)
             
             # If there are corrections, use the corrected version
-            if row['corrections']:
-                for correction in row['corrections']:
+            if corrections:
+                for correction in corrections:
                     if 'corrected_content' in correction:
                         # Create a learning pair
                         training_data.append({
@@ -132,33 +158,42 @@ class TrainingEngine:
         
         return training_data
     
-    async def learn_from_mistakes(self):
-        """Learn from feedback and corrections"""
+    async def learn_from_mistakes(self, batch_size: int = 5000):
+        """Learn from feedback and corrections
         
-        async with self.memory_system.db_pool.acquire() as conn:
-            # Get all negative feedback
-            negative_feedback = await conn.fetch("""
-                SELECT m.content, f.feedback_value, m.corrections
-                FROM learning_feedback f
-                JOIN memories m ON f.memory_id = m.id
-                WHERE f.feedback_type IN ('correction', 'negative')
-                ORDER BY f.timestamp DESC
-                LIMIT 1000
-            """)
+        Filtering and de-duplication happen in Postgres: only feedback that
+        carries a corrected_content survives, reduced to the latest one per
+        memory, and rows are paged through a cursor.
+        """
         
         learning_pairs = []
         
-        for feedback in negative_feedback:
-            original = feedback['content']
-            feedback_value = json.loads(feedback['feedback_value'])
-            
-            if 'corrected_content' in feedback_value:
-                # Learn what not to do and what to do instead
-                learning_pairs.append({
-                    'avoid': original,
-                    'prefer': feedback_value['corrected_content'],
-                    'reason': feedback_value.get('reason', 'User correction')
-                })
+        async with self.memory_system.db_pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                cursor = await conn.cursor("""
+                    SELECT DISTINCT ON (f.memory_id)
+                           m.content,
+                           f.feedback_value->>'corrected_content' AS corrected_content,
+                           f.feedback_value->>'reason' AS reason
+                    FROM learning_feedback f
+                    JOIN memories m ON f.memory_id = m.id
+                    WHERE f.feedback_type IN ('correction', 'negative')
+                    AND jsonb_typeof(f.feedback_value) = 'object'
+                    AND f.feedback_value ? 'corrected_content'
+                    ORDER BY f.memory_id, f.timestamp DESC
+                """)
+                
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        break
+                    
+                    # Learn what not to do and what to do instead
+                    learning_pairs.extend({
+                        'avoid': row['content'],
+                        'prefer': row['corrected_content'],
+                        'reason': row['reason'] or 'User correction'
+                    } for row in rows)
         
         # Store learning pairs for training
         self.feedback_data = learning_pairs
@@ -167,8 +202,21 @@ class TrainingEngine:
         
         return learning_pairs
     
-    def prepare_dataset(self) -> Dataset:
-        """Prepare dataset for training"""
+    def prepare_dataset(self,
+                        padding_mode: str = "bucket",
+                        max_length: int = 512,
+                        batch_size: int = 4) -> Dataset:
+        """Prepare dataset for training
+        
+        padding_mode:
+          "max_length" - pad every example to max_length (original behaviour)
+          "bucket"     - no padding here; the collator pads each batch to its
+                         longest example and batches are grouped by length
+          "pack"       - several short examples per max_length sequence,
+                         kept apart by PackedSequenceCollator
+        """
+        if padding_mode not in ("max_length", "bucket", "pack"):
+            raise ValueError(f"Unknown padding mode: {padding_mode}")
         
         # Combine training data and feedback data
         all_data = []
@@ -187,26 +235,46 @@ class TrainingEngine:
             text = f"### Incorrect: {item['avoid']}\n### Correct: {item['prefer']}\n### Reason: {item['reason']}"
             all_data.append({'text': text})
         
-        # Create dataset
-        dataset = Dataset.from_list(all_data)
+        # Tokenize (only texts not seen by this tokenizer before)
+        input_ids = self.token_cache.tokenize(
+            [item['text'] for item in all_data], max_length=max_length
+        )
+        lengths = [len(ids) for ids in input_ids]
+        
+        # Padding report (lengths before any padding)
+        self.dataset_stats = {
+            'padding_mode': padding_mode,
+            'examples': len(lengths),
+            'baseline': padding_stats(lengths, batch_size, "max_length", max_length),
+            **padding_stats(lengths, batch_size, padding_mode, max_length),
+        }
+        print(f"📏 Padding ratio {self.dataset_stats['padding_ratio']:.1%} "
+              f"({padding_mode}) vs {self.dataset_stats['baseline']['padding_ratio']:.1%} (max_length)")
         
-        # Tokenize
-        def tokenize_function(examples):
-            return self.tokenizer(
-                examples['text'],
-                truncation=True,
+        # Create dataset
+        if padding_mode == "pack":
+            tokenized_dataset = Dataset.from_dict(pack_dataset_rows(input_ids, max_length))
+        elif padding_mode == "max_length":
+            padded = self.tokenizer.pad(
+                {'input_ids': input_ids},
                 padding='max_length',
-                max_length=512
+                max_length=max_length
             )
-        
-        tokenized_dataset = dataset.map(tokenize_function, batched=True)
+            tokenized_dataset = Dataset.from_dict(dict(padded))
+        else:
+            tokenized_dataset = Dataset.from_dict({
+                'input_ids': input_ids,
+                'attention_mask': [[1] * n for n in lengths],
+                'length': lengths
+            })
         
         return tokenized_dataset
     
     async def train(self,
                    epochs: int = 3,
                    batch_size: int = 4,
-                   learning_rate: float = 2e-5):
+                   learning_rate: float = 2e-5,
+                   padding_mode: str = "bucket"):
         """Train the model on collected data"""
         
         if not self.model:
@@ -217,7 +285,7 @@ class TrainingEngine:
         await self.learn_from_mistakes()
         
         # Prepare dataset
-        dataset = self.prepare_dataset()
+        dataset = self.prepare_dataset(padding_mode=padding_mode, batch_size=batch_size)
         
         # Training arguments
         training_args = TrainingArguments(
@@ -235,13 +303,22 @@ class TrainingEngine:
             learning_rate=learning_rate,
             fp16=True,
             push_to_hub=False,
+            group_by_length=padding_mode == "bucket",
+            # Packed rows carry segment_lengths for the collator
+            remove_unused_columns=padding_mode != "pack",
         )
         
         # Data collator
-        data_collator = DataCollatorForLanguageModeling(
-            tokenizer=self.tokenizer,
-            mlm=False,
-        )
+        if padding_mode == "pack":
+            data_collator = PackedSequenceCollator(
+                pad_token_id=self.tokenizer.pad_token_id,
+                dtype=torch.float16,
+            )
+        else:
+            data_collator = DataCollatorForLanguageModeling(
+                tokenizer=self.tokenizer,
+                mlm=False,
+            )
         
         # Create trainer
         trainer = Trainer(
@@ -254,7 +331,16 @@ class TrainingEngine:
         print("🚀 Starting training...")
         
         # Train
-        trainer.train()
+        result = trainer.train()
+        
+        runtime = result.metrics.get('train_runtime') or 0.0
+        if runtime:
+            real_tokens = self.dataset_stats['real_tokens'] * epochs
+            padded_tokens = self.dataset_stats['padded_tokens'] * epochs
+            self.dataset_stats['tokens_per_sec'] = real_tokens / runtime
+            self.dataset_stats['padded_tokens_per_sec'] = padded_tokens / runtime
+            print(f"⚡ {real_tokens / runtime:.0f} real tokens/sec "
+                  f"({padded_tokens / runtime:.0f} incl. padding)")
         
         # Save the fine-tuned model
         trainer.save_model(self.model_path)
@@ -0,0 +1,143 @@
+"""
+EXPREZZZO Access Tracker
+Write-behind aggregation of memory access counts
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from typing import Iterable, Optional
+from redis.exceptions import ResponseError
+
+
+class AccessTracker:
+    """
+    Accumulates access_count increments and flushes them in one UPDATE
+
+    Increments are kept in process (backend="memory") or in a Redis hash
+    via HINCRBY (backend="redis", shared by every worker). A background
+    task flushes at least every `flush_interval` seconds, or sooner once
+    `max_pending` distinct ids are waiting, so counts are never more than
+    one interval stale. stop() performs a final flush.
+    """
+
+    def __init__(self,
+                 db_pool=None,
+                 redis_client=None,
+                 backend: str = "memory",
+                 flush_interval: float = 5.0,
+                 max_pending: int = 5000,
+                 redis_key: str = "access:pending"):
+        if backend not in ("memory", "redis"):
+            raise ValueError(f"Unknown access tracker backend: {backend}")
+        self.db_pool = db_pool
+        self.redis = redis_client
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.redis_key = redis_key
+        self._pending: Counter = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self):
+        """Stop the flush task and write out everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def record(self, memory_ids: Iterable[str]):
+        """Count one access for each id"""
+        memory_ids = list(memory_ids)
+        if not memory_ids:
+            return
+
+        if self.backend == "redis":
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for memory_id in memory_ids:
+                    pipe.hincrby(self.redis_key, memory_id, 1)
+                await pipe.execute()
+        else:
+            self._pending.update(memory_ids)
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Access flush failed: {e}")
+
+    async def flush(self) -> int:
+        """Apply all pending increments in a single statement"""
+        async with self._lock:
+            if self.backend == "redis":
+                return await self._flush_redis()
+
+            pending, self._pending = self._pending, Counter()
+            if not pending:
+                return 0
+            try:
+                await self._apply(list(pending.keys()), list(pending.values()))
+            except Exception:
+                # Put the counts back so the next flush retries them
+                self._pending.update(pending)
+                raise
+            return len(pending)
+
+    async def _flush_redis(self) -> int:
+        # Move the hash aside atomically so new HINCRBYs land in a fresh one
+        batch_key = f"{self.redis_key}:flushing:{uuid.uuid4().hex}"
+        try:
+            await self.redis.rename(self.redis_key, batch_key)
+        except ResponseError:
+            return 0  # No such key: nothing pending
+
+        pending = await self.redis.hgetall(batch_key)
+        if pending:
+            ids = [k.decode() if isinstance(k, bytes) else k for k in pending.keys()]
+            counts = [int(v) for v in pending.values()]
+            try:
+                await self._apply(ids, counts)
+            except Exception:
+                # Fold the counts back into the live hash for the next flush
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    for memory_id, count in zip(ids, counts):
+                        pipe.hincrby(self.redis_key, memory_id, count)
+                    pipe.delete(batch_key)
+                    await pipe.execute()
+                raise
+        await self.redis.delete(batch_key)
+        return len(pending)
+
+    async def _apply(self, memory_ids, counts):
+        # Sorted ids keep row lock order stable across concurrent flushers
+        memory_ids, counts = zip(*sorted(zip(memory_ids, counts)))
+        async with self.db_pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE memories m
+                SET access_count = m.access_count + a.hits,
+                    feedback_score = memory_effective_score(
+                        m.feedback_score, m.last_accessed, m.decay_anchor),
+                    decay_anchor = NOW(),
+                    last_accessed = NOW()
+                FROM unnest($1::text[], $2::int[]) AS a(id, hits)
+                WHERE m.id = a.id
+            """, list(memory_ids), list(counts))
@@ -0,0 +1,162 @@
+"""
+EXPREZZZO Memory Codec
+Compact, pickle-free binary encoding for Memory cache entries
+"""
+
+import json
+import struct
+import numpy as np
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import msgpack
+except ImportError:  # Fall back to compact JSON for the metadata blob
+    msgpack = None
+
+# magic, version, embedding dtype, meta format, flags, dim,
+# timestamp, last_accessed, feedback_score, access_count, int8 scale,
+# id / content / source / meta lengths
+_HEADER = struct.Struct('<BBBBBHdddifIIII')
+_MAGIC = 0xE5
+_VERSION = 1
+
+DTYPE_FLOAT32 = 0
+DTYPE_FLOAT16 = 1
+DTYPE_INT8 = 2
+_DTYPES = {'float32': DTYPE_FLOAT32, 'float16': DTYPE_FLOAT16, 'int8': DTYPE_INT8}
+
+_META_JSON = 0
+_META_MSGPACK = 1
+
+_HAS_LAST_ACCESSED = 1
+_TIMESTAMP_AWARE = 2
+_LAST_ACCESSED_AWARE = 4
+
+
+def _to_epoch(value: datetime) -> Tuple[float, bool]:
+    """Epoch seconds plus whether the datetime was timezone-aware"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc).timestamp(), False
+    return value.timestamp(), True
+
+
+def _from_epoch(seconds: float, aware: bool) -> datetime:
+    value = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return value if aware else value.replace(tzinfo=None)
+
+
+def _pack_meta(payload: Dict) -> Tuple[int, bytes]:
+    if msgpack is not None:
+        return _META_MSGPACK, msgpack.packb(payload, use_bin_type=True, default=str)
+    return _META_JSON, json.dumps(payload, separators=(',', ':'), default=str).encode()
+
+
+def _unpack_meta(fmt: int, blob: bytes) -> Dict:
+    if fmt == _META_MSGPACK:
+        return msgpack.unpackb(blob, raw=False)
+    return json.loads(blob)
+
+
+def encode_memory(memory, dtype: str = 'float32') -> bytes:
+    """Serialize a Memory to bytes (embedding as float32/float16/int8)"""
+    embedding = np.asarray(memory.embedding, dtype=np.float32).ravel()
+    scale = 0.0
+    if dtype == 'float16':
+        vector = embedding.astype(np.float16).tobytes()
+    elif dtype == 'int8':
+        scale = float(np.abs(embedding).max()) / 127.0 or 1.0
+        vector = np.clip(np.rint(embedding / scale), -127, 127).astype(np.int8).tobytes()
+    elif dtype == 'float32':
+        vector = embedding.tobytes()
+    else:
+        raise ValueError(f"Unknown embedding dtype: {dtype}")
+
+    meta_format, meta = _pack_meta({
+        'metadata': memory.metadata or {},
+        'corrections': memory.corrections or [],
+        'related_memories': memory.related_memories or [],
+    })
+
+    flags = 0
+    timestamp, aware = _to_epoch(memory.timestamp)
+    if aware:
+        flags |= _TIMESTAMP_AWARE
+    last_accessed = 0.0
+    if memory.last_accessed is not None:
+        flags |= _HAS_LAST_ACCESSED
+        last_accessed, aware = _to_epoch(memory.last_accessed)
+        if aware:
+            flags |= _LAST_ACCESSED_AWARE
+
+    memory_id = memory.id.encode()
+    content = memory.content.encode()
+    source = (memory.source or '').encode()
+
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, _DTYPES[dtype], meta_format, flags, len(embedding),
+        timestamp, last_accessed, float(memory.feedback_score or 0.0),
+        int(memory.access_count or 0), scale,
+        len(memory_id), len(content), len(source), len(meta)
+    )
+    return b''.join((header, memory_id, content, source, vector, meta))
+
+
+def decode_memory_fields(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_memory; returns Memory constructor kwargs"""
+    (magic, version, dtype, meta_format, flags, dim,
+     timestamp, last_accessed, feedback_score, access_count, scale,
+     id_len, content_len, source_len, meta_len) = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a memory codec entry")
+
+    view = memoryview(data)
+    offset = _HEADER.size
+    memory_id = bytes(view[offset:offset + id_len]).decode()
+    offset += id_len
+    content = bytes(view[offset:offset + content_len]).decode()
+    offset += content_len
+    source = bytes(view[offset:offset + source_len]).decode()
+    offset += source_len
+
+    if dtype == DTYPE_FLOAT16:
+        embedding = np.frombuffer(view, dtype=np.float16, count=dim, offset=offset).astype(np.float32)
+        offset += dim * 2
+    elif dtype == DTYPE_INT8:
+        embedding = np.frombuffer(view, dtype=np.int8, count=dim, offset=offset).astype(np.float32) * scale
+        offset += dim
+    else:
+        embedding = np.frombuffer(view, dtype=np.float32, count=dim, offset=offset).copy()
+        offset += dim * 4
+
+    meta = _unpack_meta(meta_format, bytes(view[offset:offset + meta_len]))
+
+    return {
+        'id': memory_id,
+        'content': content,
+        'embedding': embedding,
+        'metadata': meta['metadata'],
+        'source': source,
+        'timestamp': _from_epoch(timestamp, bool(flags & _TIMESTAMP_AWARE)),
+        'feedback_score': feedback_score,
+        'access_count': access_count,
+        'last_accessed': (_from_epoch(last_accessed, bool(flags & _LAST_ACCESSED_AWARE))
+                          if flags & _HAS_LAST_ACCESSED else None),
+        'corrections': meta['corrections'],
+        'related_memories': meta['related_memories'],
+    }
+
+
+def encode_recall_entry(memory_ids: Sequence[str], scores: Sequence[float]) -> bytes:
+    """Recall cache entry: just ranked ids and their scores"""
+    ids = '\0'.join(memory_ids).encode()
+    return (struct.pack('<I', len(memory_ids))
+            + np.asarray(scores, dtype=np.float32).tobytes()
+            + ids)
+
+
+def decode_recall_entry(data: bytes) -> Tuple[List[str], np.ndarray]:
+    (count,) = struct.unpack_from('<I', data)
+    scores = np.frombuffer(data, dtype=np.float32, count=count, offset=4)
+    ids = data[4 + count * 4:].decode()
+    return (ids.split('\0') if count else []), scores
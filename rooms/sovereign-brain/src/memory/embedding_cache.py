@@ -0,0 +1,122 @@
+"""
+EXPREZZZO Embedding Cache
+Content-addressed, two-tier (in-process LRU + Redis) cache of embeddings
+"""
+
+import hashlib
+import unicodedata
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class EmbeddingCache:
+    """
+    Caches embeddings by a hash of (model name, normalized text)
+
+    Tier 1 is a bounded in-process LRU, tier 2 is Redis holding raw float32
+    bytes, so any process embedding the same text pays for encode once.
+    """
+
+    def __init__(self,
+                 model_name: str,
+                 redis_client=None,
+                 max_entries: int = 10000,
+                 ttl: Optional[int] = 7 * 86400,
+                 key_prefix: str = "emb"):
+        self.model_name = model_name
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.ttl = ttl  # None = keep until Redis evicts it
+        self.key_prefix = key_prefix
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits_local = 0
+        self.hits_redis = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different strings share an entry"""
+        text = unicodedata.normalize("NFKC", text)
+        return " ".join(text.split()).lower()
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(
+            f"{self.model_name}\0{self.normalize(text)}".encode()
+        ).hexdigest()
+        return f"{self.key_prefix}:{self.model_name}:{digest}"
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        self._lru[key] = embedding
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get_or_compute(self,
+                             texts: List[str],
+                             compute: Callable[[List[str]], Awaitable[np.ndarray]]
+                             ) -> List[np.ndarray]:
+        """Return embeddings for texts, computing only the distinct misses"""
+        keys = [self.key(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        # Tier 1: in-process LRU
+        for key in keys:
+            if key in found:
+                continue
+            embedding = self._lru.get(key)
+            if embedding is not None:
+                self._lru.move_to_end(key)
+                found[key] = embedding
+                self.hits_local += 1
+
+        # Tier 2: Redis, one MGET for everything the LRU missed
+        remote_keys = [k for k in dict.fromkeys(keys) if k not in found]
+        if remote_keys and self.redis is not None:
+            values = await self.redis.mget(remote_keys)
+            for key, raw in zip(remote_keys, values):
+                if raw:
+                    embedding = np.frombuffer(raw, dtype=np.float32).copy()
+                    found[key] = embedding
+                    self._remember(key, embedding)
+                    self.hits_redis += 1
+
+        # Compute the rest once per distinct text
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            self.misses += len(missing)
+            computed = await compute(list(missing.values()))
+            for key, embedding in zip(missing.keys(), computed):
+                embedding = np.asarray(embedding, dtype=np.float32)
+                found[key] = embedding
+                self._remember(key, embedding)
+
+            if self.redis is not None:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        if self.ttl:
+                            pipe.setex(key, self.ttl, found[key].tobytes())
+                        else:
+                            pipe.set(key, found[key].tobytes())
+                    await pipe.execute()
+
+        return [found[key] for key in keys]
+
+    def clear(self):
+        """Drop the in-process tier (Redis entries expire on their own)"""
+        self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits_local + self.hits_redis + self.misses
+        return {
+            'hits_local': self.hits_local,
+            'hits_redis': self.hits_redis,
+            'misses': self.misses,
+            'hit_rate': (self.hits_local + self.hits_redis) / lookups if lookups else 0.0,
+            'local_entries': len(self._lru),
+            'max_entries': self.max_entries
+        }
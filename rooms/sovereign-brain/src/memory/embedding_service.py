@@ -0,0 +1,117 @@
+"""
+EXPREZZZO Embedding Service
+Runs the sentence embedder off the event loop and micro-batches requests
+"""
+
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+from sentence_transformers import SentenceTransformer
+
+
+class EmbeddingService:
+    """
+    Non-blocking front end for SentenceTransformer.encode
+
+    Concurrent encode() calls that arrive within `batch_window` seconds are
+    collected into a single encode call on a worker thread, so the event
+    loop keeps serving other coroutines while the model runs.
+    """
+
+    def __init__(self,
+                 model: Optional[SentenceTransformer] = None,
+                 model_name: str = 'all-MiniLM-L6-v2',
+                 max_workers: int = 1,
+                 batch_window: float = 0.005,
+                 max_batch_size: int = 64):
+        self.model = model or SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="embedder"
+        )
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    def submit(self, text: str) -> asyncio.Future:
+        """Queue a text for embedding and return a future for its vector"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return future
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Embed a single text (micro-batched with concurrent callers)"""
+        return await self.submit(text)
+
+    async def encode_many(self,
+                          texts: List[str],
+                          batch_size: int = 256) -> np.ndarray:
+        """Embed a list of texts (bulk path)
+
+        The worker gets one job of at most max_batch_size texts at a time,
+        so micro-batched encode() calls wait behind a single job instead of
+        behind the whole list.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        texts = list(texts)
+        job_size = self.max_batch_size
+        loop = asyncio.get_running_loop()
+        parts = []
+        for start in range(0, len(texts), job_size):
+            parts.append(await loop.run_in_executor(
+                self.executor, self._encode_batch,
+                texts[start:start + job_size], min(batch_size, job_size)
+            ))
+        return np.concatenate(parts)
+
+    def _encode_batch(self, texts: List[str], batch_size: int) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False
+        )
+
+    def _flush(self):
+        """Send everything queued so far to the worker as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await self.encode_many(texts, batch_size=len(texts))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    async def shutdown(self):
+        """Flush queued requests and stop the worker threads"""
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self.executor.shutdown(wait=True)
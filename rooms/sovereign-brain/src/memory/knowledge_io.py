@@ -0,0 +1,403 @@
+"""
+EXPREZZZO Knowledge Export/Import
+Streams the knowledge tables to NDJSON or Parquet parts and back via COPY
+"""
+
+import os
+import gzip
+import json
+import base64
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is optional; NDJSON always works
+    pa = None
+    pq = None
+
+
+# Column kinds drive both serialization and the staging table used on import
+TABLES = {
+    'memories': {
+        'key': 'id',
+        'columns': {
+            'id': 'text',
+            'content': 'text',
+            'embedding': 'vector',
+            'metadata': 'json',
+            'source': 'text',
+            'timestamp': 'timestamp',
+            'feedback_score': 'float',
+            'access_count': 'int',
+            'last_accessed': 'timestamp',
+            'corrections': 'json',
+            'related_memories': 'text[]',
+            'created_at': 'timestamp',
+            'updated_at': 'timestamp',
+            'decay_anchor': 'timestamp',
+        },
+    },
+    'learning_feedback': {
+        'key': 'id',
+        # Tables are exported one snapshot each, so feedback may point at
+        # memories written after the memories snapshot; such rows are skipped
+        'references': ('memory_id', 'memories', 'id'),
+        'columns': {
+            'id': 'int',
+            'memory_id': 'text',
+            'feedback_type': 'text',
+            'feedback_value': 'json',
+            'timestamp': 'timestamp',
+        },
+    },
+    'context_chains': {
+        'key': 'id',
+        'columns': {
+            'id': 'int',
+            'chain_id': 'text',
+            'memory_ids': 'text[]',
+            'context_type': 'text',
+            'metadata': 'json',
+            'created_at': 'timestamp',
+        },
+    },
+}
+
+_SQL_TYPES = {
+    'text': 'TEXT',
+    'vector': 'REAL[]',
+    'json': 'JSONB',
+    'timestamp': 'TIMESTAMPTZ',
+    'float': 'FLOAT',
+    'int': 'INTEGER',
+    'text[]': 'TEXT[]',
+}
+
+MANIFEST = "manifest.json"
+IMPORT_STATE = ".import_state.json"
+
+
+def _select_list(columns: Dict[str, str]) -> str:
+    return ", ".join(
+        f"{name}::real[] AS {name}" if kind == 'vector' else name
+        for name, kind in columns.items()
+    )
+
+
+def _write_json_atomic(path: Path, data: Dict):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def _load_json(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# -- value conversion ---------------------------------------------------------
+
+def _to_ndjson(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == 'vector':
+        return base64.b64encode(np.asarray(value, dtype=np.float32).tobytes()).decode()
+    if kind == 'timestamp':
+        return value.isoformat()
+    if kind == 'json':
+        return json.loads(value) if isinstance(value, str) else value
+    return value
+
+
+def _from_ndjson(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == 'vector':
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+    if kind == 'timestamp':
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _to_arrow(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == 'vector':
+        return np.asarray(value, dtype=np.float32).tobytes()
+    if kind == 'json':
+        return value if isinstance(value, str) else json.dumps(value)
+    return value
+
+
+def _from_arrow(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == 'vector':
+        return np.frombuffer(value, dtype=np.float32).tolist()
+    if kind == 'json':
+        return json.loads(value)
+    return value
+
+
+# -- part writers / readers ---------------------------------------------------
+
+class _NDJSONPart:
+    def __init__(self, path: Path, columns: Dict[str, str], compress: bool):
+        self.path = path
+        self.columns = columns
+        opener = gzip.open if compress else open
+        self.file = opener(path, 'wt', encoding='utf-8')
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(
+                {name: _to_ndjson(kind, row[name]) for name, kind in self.columns.items()},
+                separators=(',', ':')
+            ))
+            self.file.write("\n")
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetPart:
+    def __init__(self, path: Path, columns: Dict[str, str], compress: bool):
+        self.path = path
+        self.columns = columns
+        self.compression = 'zstd' if compress else 'none'
+        self.writer = None
+
+    def write(self, rows):
+        table = pa.Table.from_pydict({
+            name: [_to_arrow(kind, row[name]) for row in rows]
+            for name, kind in self.columns.items()
+        })
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        else:
+            self.path.touch()
+
+
+def _read_part(path: Path, fmt: str, columns: Dict[str, str], batch_size: int) -> Iterator[List[tuple]]:
+    """Yield COPY-ready record batches from one part file"""
+    names = list(columns)
+    if fmt == 'parquet':
+        if path.stat().st_size == 0:
+            return
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=names):
+            data = batch.to_pydict()
+            yield [
+                tuple(_from_arrow(columns[n], data[n][i]) for n in names)
+                for i in range(batch.num_rows)
+            ]
+        return
+
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        batch = []
+        for line in f:
+            row = json.loads(line)
+            batch.append(tuple(_from_ndjson(columns[n], row.get(n)) for n in names))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+# -- export -------------------------------------------------------------------
+
+async def export_knowledge(db_pool,
+                           output_dir: str,
+                           fmt: str = 'ndjson',
+                           compress: bool = True,
+                           batch_size: int = 1000,
+                           part_rows: int = 100000,
+                           resume: bool = True) -> Dict:
+    """
+    Stream every knowledge table into part files under output_dir
+
+    Rows are read with a server-side cursor in keyset order, batch_size at
+    a time, so memory use is flat regardless of table size. Finished parts
+    are recorded in manifest.json; a rerun resumes after the last one.
+    """
+    if fmt not in ('ndjson', 'parquet'):
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / MANIFEST
+
+    manifest = _load_json(manifest_path) if resume else None
+    if manifest and (manifest['format'] != fmt or manifest['compress'] != compress):
+        raise ValueError("Existing export uses a different format; pick another directory")
+    if not manifest:
+        manifest = {
+            'export_date': datetime.now().isoformat(),
+            'format': fmt,
+            'compress': compress,
+            'tables': {name: {'last_key': None, 'parts': [], 'rows': 0, 'done': False}
+                       for name in TABLES},
+        }
+        _write_json_atomic(manifest_path, manifest)
+
+    if fmt == 'parquet':
+        suffix, part_cls = ".parquet", _ParquetPart
+    else:
+        suffix, part_cls = (".ndjson.gz" if compress else ".ndjson"), _NDJSONPart
+
+    for table, spec in TABLES.items():
+        state = manifest['tables'][table]
+        if state['done']:
+            continue
+
+        key, columns = spec['key'], spec['columns']
+        query = f"SELECT {_select_list(columns)} FROM {table}"
+        params = []
+        if state['last_key'] is not None:
+            query += f" WHERE {key} > $1"
+            params.append(state['last_key'])
+        query += f" ORDER BY {key}"
+
+        part, part_path, part_count, last_key = None, None, 0, None
+        async with db_pool.acquire() as conn:
+            async with conn.transaction(isolation='repeatable_read', readonly=True):
+                cursor = await conn.cursor(query, *params)
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        break
+                    if part is None:
+                        part_path = out / f"{table}-{len(state['parts']):05d}{suffix}"
+                        part = part_cls(part_path.with_name(part_path.name + ".tmp"), columns, compress)
+                        part_count = 0
+                    part.write(rows)
+                    part_count += len(rows)
+                    last_key = rows[-1][key]
+
+                    if part_count >= part_rows:
+                        _finish_part(part, part_path, state, part_count, last_key)
+                        _write_json_atomic(manifest_path, manifest)
+                        part = None
+
+        if part is not None:
+            _finish_part(part, part_path, state, part_count, last_key)
+        state['done'] = True
+        _write_json_atomic(manifest_path, manifest)
+        print(f"  ✅ {table}: {state['rows']} rows in {len(state['parts'])} parts")
+
+    manifest['statistics'] = {
+        f"total_{name}": state['rows'] for name, state in manifest['tables'].items()
+    }
+    _write_json_atomic(manifest_path, manifest)
+    return manifest
+
+
+def _finish_part(part, part_path: Path, state: Dict, count: int, last_key: Any):
+    part.close()
+    os.replace(part.path, part_path)
+    state['parts'].append(part_path.name)
+    state['rows'] += count
+    state['last_key'] = last_key
+
+
+# -- import -------------------------------------------------------------------
+
+async def import_knowledge(db_pool,
+                           input_dir: str,
+                           batch_size: int = 1000,
+                           resume: bool = True) -> Dict:
+    """
+    Restore an export made by export_knowledge
+
+    Each part is COPYed in batches into a staging table and merged with
+    ON CONFLICT DO NOTHING inside its own transaction; finished parts are
+    recorded in .import_state.json so an interrupted import resumes.
+    Rows whose referenced parent is missing (feedback for a memory that
+    is not in the export) are skipped and counted as <table>_skipped.
+    """
+    src = Path(input_dir)
+    manifest = _load_json(src / MANIFEST)
+    if not manifest:
+        raise FileNotFoundError(f"No {MANIFEST} in {input_dir}")
+    if manifest['format'] == 'parquet' and pa is None:
+        raise RuntimeError("Parquet import needs pyarrow (pip install pyarrow)")
+
+    state_path = src / IMPORT_STATE
+    done = (_load_json(state_path) if resume else None) or {name: [] for name in TABLES}
+    totals = {}
+
+    # Tables in dependency order: feedback references memories
+    for table, spec in TABLES.items():
+        key, columns = spec['key'], spec['columns']
+        names = list(columns)
+        staging = f"{table}_import_staging"
+        totals[table] = 0
+        orphaned = "FALSE"
+        if 'references' in spec:
+            column, parent, parent_key = spec['references']
+            totals[f"{table}_skipped"] = 0
+            orphaned = f"""{staging}.{column} IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM {parent} WHERE {parent}.{parent_key} = {staging}.{column}
+            )"""
+
+        for part_name in manifest['tables'][table]['parts']:
+            if part_name in done.setdefault(table, []):
+                continue
+
+            async with db_pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute(f"""
+                        CREATE TEMP TABLE IF NOT EXISTS {staging} (
+                            {", ".join(f"{n} {_SQL_TYPES[k]}" for n, k in columns.items())}
+                        ) ON COMMIT DELETE ROWS
+                    """)
+                    for records in _read_part(src / part_name, manifest['format'], columns, batch_size):
+                        await conn.copy_records_to_table(staging, records=records, columns=names)
+                        totals[table] += len(records)
+                    if 'references' in spec:
+                        skipped = await conn.fetchval(
+                            f"SELECT COUNT(*) FROM {staging} WHERE {orphaned}"
+                        )
+                        totals[table] -= skipped
+                        totals[f"{table}_skipped"] += skipped
+                    # REAL[] assignment-casts to vector or halfvec columns alike
+                    await conn.execute(f"""
+                        INSERT INTO {table} ({", ".join(names)})
+                        SELECT {", ".join(names)} FROM {staging}
+                        WHERE NOT ({orphaned})
+                        ON CONFLICT ({key}) DO NOTHING
+                    """)
+
+            done[table].append(part_name)
+            _write_json_atomic(state_path, done)
+
+        if columns[key] == 'int':
+            # Keep SERIAL sequences ahead of the restored ids
+            async with db_pool.acquire() as conn:
+                await conn.execute(f"""
+                    SELECT setval(pg_get_serial_sequence('{table}', '{key}'),
+                                  COALESCE((SELECT MAX({key}) FROM {table}), 1))
+                """)
+        print(f"  ✅ {table}: {totals[table]} rows restored")
+        if totals.get(f"{table}_skipped"):
+            print(f"  ⚠️ {table}: {totals[f'{table}_skipped']} rows skipped "
+                  f"(their {spec['references'][1]} row is not in the export)")
+
+    return totals
@@ -0,0 +1,175 @@
+"""
+EXPREZZZO Linking Engine
+Set-based bidirectional linking of related memories
+"""
+
+import asyncio
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class LinkingEngine:
+    """
+    Links each memory to its nearest neighbours, and back
+
+    Neighbours are found with the embeddings the memories were stored with:
+    the in-process vector index when one is given, otherwise one LATERAL
+    pgvector query over the stored rows. Nothing is re-embedded and no
+    access counts are touched. Forward and reverse links are each written
+    with a single UPDATE ... FROM unnest().
+
+    enqueue() defers the work to a background task that links queued
+    memories in batches of up to `batch_size` at least every
+    `flush_interval` seconds. stop() links everything still queued.
+    """
+
+    def __init__(self,
+                 db_pool=None,
+                 vector_index=None,
+                 limit: int = 5,
+                 threshold: float = 0.7,
+                 batch_size: int = 1000,
+                 flush_interval: float = 1.0):
+        self.db_pool = db_pool
+        self.vector_index = vector_index
+        self.limit = limit
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, np.ndarray] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self):
+        """Start the background linking task"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._link_loop())
+
+    async def stop(self):
+        """Stop the background task and link everything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            await self.flush()
+
+    def enqueue(self, memories):
+        """Queue memories for background linking; returns immediately"""
+        for memory in memories:
+            self._pending[memory.id] = memory.embedding
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    async def _link_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Background linking failed: {e}")
+
+    async def flush(self) -> int:
+        """Link up to batch_size queued memories"""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            ids = list(self._pending)[:self.batch_size]
+            batch = [(memory_id, self._pending.pop(memory_id)) for memory_id in ids]
+            try:
+                await self._link(batch)
+            except Exception:
+                # Requeue unless a newer version was queued meanwhile
+                for memory_id, embedding in batch:
+                    self._pending.setdefault(memory_id, embedding)
+                raise
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+            return len(batch)
+
+    async def link(self, memories) -> int:
+        """Link memories now; returns the number of links written"""
+        return await self._link([(m.id, m.embedding) for m in memories])
+
+    async def _link(self, batch: List[Tuple[str, np.ndarray]]) -> int:
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                if self.vector_index is not None:
+                    links = self._search_index(batch)
+                else:
+                    links = await self._search_db(conn, [memory_id for memory_id, _ in batch])
+                if not links:
+                    return 0
+
+                sources = [src for src, _ in links]
+                targets = [dst for _, dst in links]
+
+                # Update new memories with their related ones
+                await conn.execute("""
+                    UPDATE memories m
+                    SET related_memories = l.related_ids
+                    FROM (
+                        SELECT src AS id, array_agg(dst ORDER BY n) AS related_ids
+                        FROM unnest($1::text[], $2::text[]) WITH ORDINALITY AS t(src, dst, n)
+                        GROUP BY src
+                    ) l
+                    WHERE m.id = l.id
+                """, sources, targets)
+
+                # Link back from related memories
+                await conn.execute("""
+                    UPDATE memories m
+                    SET related_memories = COALESCE(m.related_memories, '{}') || ARRAY(
+                        SELECT unnest(l.new_ids)
+                        EXCEPT
+                        SELECT unnest(m.related_memories)
+                    )
+                    FROM (
+                        SELECT dst AS id, array_agg(DISTINCT src) AS new_ids
+                        FROM unnest($1::text[], $2::text[]) AS t(src, dst)
+                        GROUP BY dst
+                    ) l
+                    WHERE m.id = l.id
+                    AND NOT (l.new_ids <@ COALESCE(m.related_memories, '{}'))
+                """, sources, targets)
+        return len(links)
+
+    def _search_index(self, batch: List[Tuple[str, np.ndarray]]) -> List[Tuple[str, str]]:
+        links = []
+        for memory_id, embedding in batch:
+            # One extra hit because the memory finds itself
+            hits = self.vector_index.search(embedding, self.limit + 1, self.threshold)
+            related = [related_id for related_id, _ in hits if related_id != memory_id]
+            links.extend((memory_id, related_id) for related_id in related[:self.limit])
+        return links
+
+    async def _search_db(self, conn, memory_ids: List[str]) -> List[Tuple[str, str]]:
+        # Nearest neighbours of every memory in a single query, using the
+        # embedding already stored on its row
+        rows = await conn.fetch("""
+            SELECT n.id AS memory_id, r.id AS related_id
+            FROM memories n
+            CROSS JOIN LATERAL (
+                SELECT m.id, m.embedding <=> n.embedding AS distance
+                FROM memories m
+                WHERE m.id <> n.id
+                AND 1 - (m.embedding <=> n.embedding) > $2
+                ORDER BY m.embedding <=> n.embedding
+                LIMIT $3
+            ) r
+            WHERE n.id = ANY($1::text[])
+            ORDER BY n.id, r.distance
+        """, memory_ids, self.threshold, self.limit)
+        return [(row['memory_id'], row['related_id']) for row in rows]
@@ -0,0 +1,183 @@
+"""
+EXPREZZZO Near-Duplicate Index
+MinHash-LSH over memory content to catch lightly edited copies
+"""
+
+import os
+import re
+import zlib
+import unicodedata
+import numpy as np
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_MERSENNE = (1 << 31) - 1
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) with bands * rows == num_perm and an LSH knee just below threshold"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Finds stored texts whose estimated Jaccard similarity is >= threshold
+
+    Each text becomes a set of character shingles (after NFKC, lowercase
+    and whitespace folding) and a `num_perm` MinHash signature. Signatures
+    are split into bands and hashed into buckets, so a lookup only compares
+    against texts sharing at least one band: O(bands + candidates) per
+    insert instead of a scan over every stored text. Bands are chosen so
+    the LSH knee sits just below the threshold, favouring recall; every
+    candidate is then checked against the exact threshold.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 num_perm: int = 128,
+                 shingle_size: int = 5,
+                 snapshot_path: Optional[str] = "./data/index/memories_minhash.npz",
+                 seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.snapshot_path = snapshot_path
+        self.seed = seed
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE, size=(num_perm, 1), dtype=np.uint64)
+
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.signatures = np.zeros((1024, num_perm), dtype=np.uint32)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of one text"""
+        text = re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text).lower()).strip()
+        k = self.shingle_size
+        shingles = {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) & _MERSENNE for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (self._a * hashes[None, :] + self._b) % _MERSENNE
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def query(self,
+              text: Optional[str] = None,
+              signature: Optional[np.ndarray] = None) -> Optional[Tuple[str, float]]:
+        """Best stored (id, estimated Jaccard) at or above threshold, if any"""
+        if signature is None:
+            signature = self.signature(text)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None
+
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self.signatures[rows] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            return None
+        return self.ids[rows[best]], float(similarity[best])
+
+    def add(self,
+            ids: Sequence[str],
+            texts: Optional[Sequence[str]] = None,
+            signatures: Optional[np.ndarray] = None):
+        """Index texts (or precomputed signatures) under ids"""
+        if signatures is None:
+            signatures = [self.signature(text) for text in texts]
+        for memory_id, signature in zip(ids, signatures):
+            if memory_id in self.positions:
+                continue  # Content of an id is fixed once indexed
+            row = len(self.ids)
+            if row >= len(self.signatures):
+                grown = np.zeros((len(self.signatures) * 2, self.num_perm), dtype=np.uint32)
+                grown[:row] = self.signatures[:row]
+                self.signatures = grown
+            self.signatures[row] = signature
+            self.ids.append(memory_id)
+            self.positions[memory_id] = row
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band][key].append(row)
+
+    async def build_from_db(self, conn, batch_size: int = 10000):
+        """Index the content of every memory"""
+        await self._add_from_db(conn, "SELECT id, content, updated_at FROM memories", batch_size)
+
+    async def warm_start(self, conn, snapshot_path: Optional[str] = None):
+        """Load the on-disk snapshot, then catch up on rows changed since"""
+        path = snapshot_path or self.snapshot_path
+        if path and os.path.exists(path):
+            self.load(path)
+        if self.watermark is None:
+            await self.build_from_db(conn)
+            return
+        await self._add_from_db(conn, """
+            SELECT id, content, updated_at FROM memories WHERE updated_at > $1
+        """, 10000, self.watermark)
+
+    async def _add_from_db(self, conn, query: str, batch_size: int, *params):
+        async with conn.transaction():
+            cursor = await conn.cursor(query, *params)
+            while True:
+                rows = await cursor.fetch(batch_size)
+                if not rows:
+                    break
+                self.add([row['id'] for row in rows], [row['content'] for row in rows])
+                newest = max(row['updated_at'] for row in rows)
+                if self.watermark is None or newest > self.watermark:
+                    self.watermark = newest
+
+    def save(self, path: Optional[str] = None):
+        """Write a snapshot for warm starts"""
+        path = path or self.snapshot_path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            signatures=self.signatures[:len(self.ids)],
+            ids=np.array(self.ids, dtype=str),
+            num_perm=np.array(self.num_perm),
+            shingle_size=np.array(self.shingle_size),
+            seed=np.array(self.seed),
+            watermark=np.array(self.watermark.isoformat() if self.watermark else "")
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None):
+        """Restore a snapshot written by save(); bands are rebuilt from signatures"""
+        snapshot = np.load(path or self.snapshot_path)
+        params = (int(snapshot['num_perm']), int(snapshot['shingle_size']), int(snapshot['seed']))
+        if params != (self.num_perm, self.shingle_size, self.seed):
+            return  # Built with other parameters: start fresh
+        self.ids, self.positions = [], {}
+        self.signatures = np.zeros((max(1024, len(snapshot['ids'])), self.num_perm), dtype=np.uint32)
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self.add([str(memory_id) for memory_id in snapshot['ids']], signatures=snapshot['signatures'])
+        watermark = str(snapshot['watermark'])
+        self.watermark = datetime.fromisoformat(watermark) if watermark else None
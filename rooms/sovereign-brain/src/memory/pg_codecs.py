@@ -0,0 +1,84 @@
+"""
+EXPREZZZO Postgres Codecs
+Binary asyncpg codecs for pgvector and JSON columns
+"""
+
+import json
+import struct
+import numpy as np
+
+_VECTOR_HEADER = struct.Struct('>HH')  # dim, unused
+_JSONB_VERSION = b'\x01'
+
+
+def encode_vector(value) -> bytes:
+    """ndarray / sequence -> pgvector binary (big-endian float32)"""
+    vector = np.asarray(value, dtype='>f4').ravel()
+    return _VECTOR_HEADER.pack(len(vector), 0) + vector.tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """pgvector binary -> native float32 ndarray"""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype='>f4', count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+def encode_halfvec(value) -> bytes:
+    """ndarray / sequence -> pgvector halfvec binary (big-endian float16)"""
+    vector = np.asarray(value, dtype='>f2').ravel()
+    return _VECTOR_HEADER.pack(len(vector), 0) + vector.tobytes()
+
+
+def decode_halfvec(data: bytes) -> np.ndarray:
+    """pgvector halfvec binary -> native float32 ndarray"""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype='>f2', count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+def vector_literal(value) -> str:
+    """pgvector text form, for vectors sent inside a text[] (e.g. unnest($1::text[])::vector)"""
+    return '[' + ','.join(map(repr, np.asarray(value, dtype=np.float32).ravel().tolist())) + ']'
+
+
+def _encode_jsonb(value) -> bytes:
+    return _JSONB_VERSION + json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+def _decode_jsonb(data: bytes):
+    return json.loads(data[1:])
+
+
+_VECTOR_CODECS = {
+    'vector': (encode_vector, decode_vector),
+    'halfvec': (encode_halfvec, decode_halfvec),
+}
+
+
+async def register_codecs(conn):
+    """Pool init hook: vector/halfvec <-> ndarray, json/jsonb <-> Python objects
+
+    Runs for every new pool connection. The vector codecs are skipped while
+    the extension does not exist yet; call pool.expire_connections() after
+    CREATE EXTENSION so later connections pick them up. halfvec needs
+    pgvector 0.7+ and is skipped on older versions.
+    """
+    await conn.set_type_codec(
+        'jsonb', schema='pg_catalog', format='binary',
+        encoder=_encode_jsonb, decoder=_decode_jsonb
+    )
+    await conn.set_type_codec(
+        'json', schema='pg_catalog', format='text',
+        encoder=lambda value: json.dumps(value, default=str), decoder=json.loads
+    )
+
+    rows = await conn.fetch("""
+        SELECT t.typname, n.nspname FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname IN ('vector', 'halfvec')
+    """)
+    for row in rows:
+        encoder, decoder = _VECTOR_CODECS[row['typname']]
+        await conn.set_type_codec(
+            row['typname'], schema=row['nspname'], format='binary',
+            encoder=encoder, decoder=decoder
+        )
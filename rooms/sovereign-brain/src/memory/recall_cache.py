@@ -0,0 +1,138 @@
+"""
+EXPREZZZO Recall Cache
+Versioned recall result cache with targeted invalidation
+"""
+
+import time
+import hashlib
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.memory.codec import encode_recall_entry, decode_recall_entry
+
+
+class RecallCache:
+    """
+    Caches ranked recall results under a key built from every query
+    parameter plus a global generation counter
+
+    Writes that can change ranking everywhere (new memories, feedback,
+    score decay) bump the generation, which orphans every older entry at
+    once. Writes that only touch specific memories can delete just the
+    entries that contain them, via a reverse index
+    recall:byid:{generation}:{memory_id}; scoping it to the generation
+    lets the sets of orphaned generations expire instead of growing.
+    """
+
+    def __init__(self,
+                 redis_client=None,
+                 ttl: int = 86400,
+                 generation_refresh: float = 1.0,
+                 prefix: str = "recall"):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.generation_refresh = generation_refresh  # Max staleness of other workers' bumps
+        self.prefix = prefix
+        self._generation = 0
+        self._generation_read_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.prefix}:generation"
+
+    def _reverse_key(self, generation: Any, memory_id: str) -> str:
+        return f"{self.prefix}:byid:{generation}:{memory_id}"
+
+    def _key_generation(self, key: str) -> str:
+        """Generation embedded in a key() result"""
+        return key.rsplit(":", 2)[1]
+
+    async def generation(self) -> int:
+        now = time.monotonic()
+        if now - self._generation_read_at >= self.generation_refresh:
+            value = await self.redis.get(self._generation_key)
+            self._generation = int(value or 0)
+            self._generation_read_at = now
+        return self._generation
+
+    async def key(self, query: str, **params: Any) -> str:
+        """Cache key covering the query text, every parameter and the generation"""
+        generation = await self.generation()
+        signature = "\0".join(
+            [query] + [f"{name}={params[name]!r}" for name in sorted(params)]
+        )
+        digest = hashlib.sha256(signature.encode()).hexdigest()
+        return f"{self.prefix}:{generation}:{digest}"
+
+    async def get(self, key: str) -> Optional[Tuple[List[str], np.ndarray]]:
+        cached = await self.redis.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return decode_recall_entry(cached)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Tuple[List[str], np.ndarray]]]:
+        """get() for several keys in one MGET"""
+        if not keys:
+            return []
+        results = []
+        for cached in await self.redis.mget(list(keys)):
+            if cached is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(decode_recall_entry(cached))
+        return results
+
+    async def put(self, key: str, memory_ids: Sequence[str], scores: Sequence[float]):
+        """Store a result and register it under each memory it contains"""
+        await self.put_many([(key, memory_ids, scores)])
+
+    async def put_many(self, entries: Sequence[Tuple[str, Sequence[str], Sequence[float]]]):
+        """put() for several (key, memory_ids, scores) results in one pipeline"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, memory_ids, scores in entries:
+                pipe.setex(key, self.ttl, encode_recall_entry(memory_ids, scores))
+                generation = self._key_generation(key)
+                for memory_id in memory_ids:
+                    reverse_key = self._reverse_key(generation, memory_id)
+                    pipe.sadd(reverse_key, key)
+                    pipe.expire(reverse_key, self.ttl)
+            await pipe.execute()
+
+    async def bump_generation(self):
+        """Invalidate every cached recall result"""
+        self._generation = await self.redis.incr(self._generation_key)
+        self._generation_read_at = time.monotonic()
+
+    async def invalidate_memories(self, memory_ids: Sequence[str]):
+        """Drop only the cached results (of the live generation) that contain these memories"""
+        if not memory_ids:
+            return
+        # Workers may still be writing under the generation we last saw
+        generations = {self._generation}
+        self._generation_read_at = 0.0
+        generations.add(await self.generation())
+        reverse_keys = [self._reverse_key(g, i) for g in generations for i in memory_ids]
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for reverse_key in reverse_keys:
+                pipe.smembers(reverse_key)
+            members = await pipe.execute()
+
+        keys = set(reverse_keys)
+        for entry_keys in members:
+            keys.update(entry_keys)
+        await self.redis.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'generation': self._generation,
+            'ttl': self.ttl
+        }
@@ -0,0 +1,69 @@
+"""
+EXPREZZZO Recall Reranking
+Vectorized second-stage scoring of recall candidates
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+
+DEFAULT_WEIGHTS = {
+    'similarity': 1.0,
+    'feedback_score': 0.05,
+    'access_count': 0.01,  # applied to log1p(access_count)
+}
+
+
+def rerank_candidates(rows: List[Dict],
+                      limit: int,
+                      threshold: float = 0.5,
+                      weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Apply the similarity threshold and blend in feedback and popularity
+
+    `rows` need 'similarity', 'feedback_score' and 'access_count'. The
+    blended score is written back to each returned row as 'score'.
+    """
+    if not rows:
+        return []
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    similarity = np.fromiter((r['similarity'] for r in rows), dtype=np.float64, count=len(rows))
+    feedback = np.fromiter((r['feedback_score'] or 0.0 for r in rows), dtype=np.float64, count=len(rows))
+    access = np.fromiter((r['access_count'] or 0 for r in rows), dtype=np.float64, count=len(rows))
+
+    score = (weights['similarity'] * similarity
+             + weights['feedback_score'] * feedback
+             + weights['access_count'] * np.log1p(access))
+
+    keep = np.flatnonzero(similarity > threshold)
+    order = keep[np.argsort(-score[keep], kind='stable')][:limit]
+
+    return [dict(rows[i], score=float(score[i])) for i in order]
+
+
+RRF_K = 60
+
+
+def fuse_rankings(rankings: List[List[Dict]],
+                  limit: int,
+                  k: int = RRF_K) -> List[Dict]:
+    """
+    Reciprocal-rank fusion of several ranked row lists (best first)
+
+    Each row scores sum(1 / (k + rank)) over the lists it appears in;
+    ties keep first-appearance order. Rows need an 'id'; the first copy
+    of each row is returned with the fused score as 'score'.
+    """
+    rows = [row for ranking in rankings for row in ranking]
+    if not rows:
+        return []
+
+    ids = np.array([row['id'] for row in rows])
+    ranks = np.concatenate([np.arange(1, len(ranking) + 1) for ranking in rankings])
+    unique, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    score = np.bincount(inverse, weights=1.0 / (k + ranks), minlength=len(unique))
+
+    order = np.lexsort((first, -score))[:limit]
+
+    return [dict(rows[first[i]], score=float(score[i])) for i in order]
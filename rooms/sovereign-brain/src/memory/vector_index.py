@@ -0,0 +1,366 @@
+"""
+EXPREZZZO Vector Index
+In-process ANN index over the memories table (IVF-flat on a NumPy matrix)
+"""
+
+import os
+import asyncio
+import numpy as np
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class VectorIndex(ABC):
+    """
+    Interface for recall backends that live next to SovereignMemorySystem
+
+    Vectors are L2-normalized on the way in, so inner product is cosine
+    similarity and scores are directly comparable with pgvector's
+    1 - (embedding <=> query).
+    """
+
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        ...
+
+    @abstractmethod
+    def search(self,
+               query: np.ndarray,
+               k: int,
+               threshold: float = -1.0) -> List[Tuple[str, float]]:
+        ...
+
+    def search_many(self,
+                    queries: np.ndarray,
+                    k: int,
+                    threshold: float = -1.0) -> List[List[Tuple[str, float]]]:
+        """search() for each row of queries, in order"""
+        return [self.search(query, k, threshold) for query in queries]
+
+    def needs_training(self) -> bool:
+        """True when retrain() would improve the index"""
+        return False
+
+    async def retrain(self):
+        """Rebuild internal structures without blocking the event loop"""
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    @abstractmethod
+    async def build_from_db(self, conn, batch_size: int = 10000):
+        ...
+
+    @abstractmethod
+    async def warm_start(self, conn, snapshot_path: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    def save(self, path: str):
+        ...
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class IVFFlatIndex(VectorIndex):
+    """
+    IVF-flat index over one contiguous float32 matrix
+
+    Rows live in a growable (capacity x dim) array; each row is assigned to
+    its nearest k-means centroid. A search scores the query against the
+    centroids, then scans only the rows of the `nprobe` closest lists.
+    Below `min_train_size` rows the index stays a flat exact scan. With
+    n_lists=None it wants a retrain once it holds `retrain_factor` times
+    n_lists**2 rows, so the list count keeps tracking sqrt(N) as it grows.
+
+    add() never trains: it only assigns new rows to the current centroids.
+    retrain() clusters a copy of the rows in a worker thread and swaps the
+    result in; the owner schedules it when needs_training() says so.
+    """
+
+    def __init__(self,
+                 dim: int = 384,
+                 n_lists: Optional[int] = None,
+                 nprobe: int = 8,
+                 min_train_size: int = 4096,
+                 kmeans_iters: int = 10,
+                 retrain_factor: float = 4.0,
+                 snapshot_path: Optional[str] = "./data/index/memories_ivf.npz"):
+        self.dim = dim
+        self.n_lists = n_lists  # None = sqrt(N) at train time
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.kmeans_iters = kmeans_iters
+        self.retrain_factor = retrain_factor
+        self.snapshot_path = snapshot_path
+
+        self.vectors = np.zeros((1024, dim), dtype=np.float32)
+        self.count = 0
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(1024, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None  # rebuilt lazily
+        self.watermark: Optional[datetime] = None
+        self._training: Optional[asyncio.Task] = None
+        self._dirty: List[np.ndarray] = []  # Rows written while a retrain runs
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed: int):
+        capacity = self.vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:self.count] = self.vectors[:self.count]
+        assignments = np.zeros(capacity, dtype=np.int32)
+        assignments[:self.count] = self.assignments[:self.count]
+        self.vectors, self.assignments = vectors, assignments
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert or overwrite vectors, assigned to the current centroids"""
+        vectors = _normalize(np.asarray(vectors).reshape(-1, self.dim))
+        self._grow(self.count + len(ids))
+
+        rows = np.empty(len(ids), dtype=np.int64)
+        for i, memory_id in enumerate(ids):
+            row = self.positions.get(memory_id)
+            if row is None:
+                row = self.count
+                self.count += 1
+                self.ids.append(memory_id)
+                self.positions[memory_id] = row
+            rows[i] = row
+        self.vectors[rows] = vectors
+
+        if self._training is not None:
+            self._dirty.append(rows)
+        if self.centroids is not None:
+            self.assignments[rows] = np.argmax(vectors @ self.centroids.T, axis=1)
+            self._lists = None
+
+    def needs_training(self) -> bool:
+        """First train at min_train_size rows, then again as sqrt(N) outgrows n_lists"""
+        if self.centroids is None:
+            return self.count >= self.min_train_size
+        return self.n_lists is None and self.count >= self.retrain_factor * len(self.centroids) ** 2
+
+    def train(self):
+        """(Re)cluster all rows with spherical k-means, in the calling thread"""
+        self.centroids, assignments = self._cluster(self.vectors[:self.count])
+        self.assignments[:self.count] = assignments
+        self._lists = None
+
+    async def retrain(self):
+        """train() on a copy of the rows in a worker thread, then swap it in
+
+        Rows added meanwhile are assigned to the new centroids at the swap.
+        Concurrent callers share one run.
+        """
+        if self._training is None:
+            self._training = asyncio.ensure_future(self._retrain())
+        await asyncio.shield(self._training)
+
+    async def _retrain(self):
+        try:
+            count = self.count
+            data = self.vectors[:count].copy()
+            self._dirty = []
+            centroids, assignments = await asyncio.get_running_loop().run_in_executor(
+                None, self._cluster, data
+            )
+
+            self.centroids = centroids
+            self.assignments[:count] = assignments
+            stale = [np.arange(count, self.count)] + [rows[rows < count] for rows in self._dirty]
+            stale = np.unique(np.concatenate(stale))
+            if len(stale):
+                self.assignments[stale] = np.argmax(self.vectors[stale] @ centroids.T, axis=1)
+            self._lists = None
+        finally:
+            self._dirty = []
+            self._training = None
+
+    def _cluster(self, data: np.ndarray):
+        """Spherical k-means over data; returns (centroids, assignments)"""
+        count = len(data)
+        n_lists = self.n_lists or max(1, int(np.sqrt(count)))
+        n_lists = min(n_lists, count)
+
+        rng = np.random.default_rng(0)
+        sample = data[rng.choice(count, size=min(count, n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iters):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        assignments = np.empty(count, dtype=np.int32)
+        for start in range(0, count, 65536):
+            chunk = data[start:start + 65536]
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return centroids, assignments
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            assignments = self.assignments[:self.count]
+            order = np.argsort(assignments, kind='stable')
+            bounds = np.searchsorted(assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    def search(self,
+               query: np.ndarray,
+               k: int,
+               threshold: float = -1.0) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) pairs above threshold"""
+        if self.count == 0:
+            return []
+        query = _normalize(np.asarray(query).reshape(self.dim))
+
+        if self.centroids is None:
+            rows = np.arange(self.count)
+            scores = self.vectors[:self.count] @ query
+        else:
+            probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            lists = self._inverted_lists()
+            rows = np.concatenate([lists[p] for p in probes])
+            scores = self.vectors[rows] @ query
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (self.ids[rows[i]], float(scores[i]))
+            for i in top
+            if scores[i] > threshold
+        ]
+
+    def search_many(self,
+                    queries: np.ndarray,
+                    k: int,
+                    threshold: float = -1.0) -> List[List[Tuple[str, float]]]:
+        """Top-k per query; an untrained (flat) index scores all queries in one matmul"""
+        queries = _normalize(np.asarray(queries).reshape(-1, self.dim))
+        if self.centroids is not None or self.count == 0:
+            return [self.search(query, k, threshold) for query in queries]
+
+        scores = queries @ self.vectors[:self.count].T
+        k = min(k, self.count)
+        if k < self.count:
+            top = np.argpartition(-scores, k, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(self.count), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [(self.ids[row], float(score)) for row, score in zip(rows, row_scores) if score > threshold]
+            for rows, row_scores in zip(top, top_scores)
+        ]
+
+    async def build_from_db(self, conn, batch_size: int = 10000):
+        """Load every embedding from the memories table and train"""
+        async with conn.transaction():
+            cursor = await conn.cursor("""
+                SELECT id, embedding, updated_at
+                FROM memories
+                WHERE embedding IS NOT NULL
+            """)
+            while True:
+                rows = await cursor.fetch(batch_size)
+                if not rows:
+                    break
+                self._add_rows(rows)
+
+        if self.count >= self.min_train_size:
+            await self.retrain()
+
+    async def warm_start(self, conn, snapshot_path: Optional[str] = None):
+        """Load the on-disk snapshot, then catch up on rows changed since"""
+        path = snapshot_path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            await self.build_from_db(conn)
+            return
+
+        self.load(path)
+        if self.watermark is None:
+            await self.build_from_db(conn)
+            return
+
+        async with conn.transaction():
+            cursor = await conn.cursor("""
+                SELECT id, embedding, updated_at
+                FROM memories
+                WHERE embedding IS NOT NULL
+                AND updated_at > $1
+            """, self.watermark)
+            while True:
+                rows = await cursor.fetch(10000)
+                if not rows:
+                    break
+                self._add_rows(rows)
+
+        if self.needs_training():
+            await self.retrain()
+
+    def _add_rows(self, rows):
+        ids = [row['id'] for row in rows]
+        vectors = np.stack([row['embedding'] for row in rows]).astype(np.float32, copy=False)
+        self.add(ids, vectors)
+        newest = max(row['updated_at'] for row in rows)
+        if self.watermark is None or newest > self.watermark:
+            self.watermark = newest
+
+    def save(self, path: Optional[str] = None):
+        """Write a snapshot for warm starts"""
+        path = path or self.snapshot_path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            vectors=self.vectors[:self.count],
+            ids=np.array(self.ids, dtype=str),
+            assignments=self.assignments[:self.count],
+            centroids=self.centroids if self.centroids is not None else np.empty((0, self.dim), dtype=np.float32),
+            watermark=np.array(self.watermark.isoformat() if self.watermark else "")
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None):
+        """Restore a snapshot written by save()"""
+        snapshot = np.load(path or self.snapshot_path)
+        vectors = snapshot['vectors']
+        self.vectors = np.zeros((max(1024, len(vectors)), self.dim), dtype=np.float32)
+        self.assignments = np.zeros(self.vectors.shape[0], dtype=np.int32)
+        self.count = len(vectors)
+        self.vectors[:self.count] = vectors
+        self.assignments[:self.count] = snapshot['assignments']
+        self.ids = [str(memory_id) for memory_id in snapshot['ids']]
+        self.positions = {memory_id: i for i, memory_id in enumerate(self.ids)}
+        centroids = snapshot['centroids']
+        self.centroids = centroids if len(centroids) else None
+        watermark = str(snapshot['watermark'])
+        self.watermark = datetime.fromisoformat(watermark) if watermark else None
+        self._lists = None
@@ -1,30 +1,246 @@
 #!/usr/bin/env python3
 import json
 import redis
+import redis.asyncio as aioredis
+import asyncio
 import hashlib
 import os
+import re
+import math
+import time
+import itertools
 from datetime import datetime
 from pathlib import Path
+from src.memory.near_dedup import NearDuplicateIndex
+
+try:
+    import ijson
+except ImportError:  # Streaming still works through the json fallback below
+    ijson = None
+
+
+def iter_json_array(file_path, chunk_size=1 << 20):
+    """Yield the items of a top-level JSON array without loading the file"""
+    if ijson is not None:
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+        return
+
+    decoder = json.JSONDecoder()
+    separators = re.compile(r'[\s,]*')
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{file_path} is not a JSON array")
+        pos, eof = 1, False
+        while True:
+            pos = separators.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Item runs past the buffer: drop what's consumed, read more
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+            pos = end
+
+
+def iter_chatgpt_messages(conversations):
+    """Flatten ChatGPT export conversations into one record per message"""
+    for conv in conversations:
+        title = conv.get('title') or 'Untitled'
+        conv_id = conv.get('id') or conv.get('conversation_id') or title
+        for node_id, node in (conv.get('mapping') or {}).items():
+            message = (node or {}).get('message') or {}
+            role = (message.get('author') or {}).get('role')
+            if role not in ('user', 'assistant'):
+                continue
+            parts = (message.get('content') or {}).get('parts') or []
+            text = "\n".join(p for p in parts if isinstance(p, str)).strip()
+            if not text:
+                continue
+            yield {
+                'id': f"{conv_id}:{message.get('id') or node_id}",
+                'content': f"ChatGPT - {title}\n{role}: {text}",
+                'metadata': {
+                    'conversation_id': conv_id,
+                    'title': title,
+                    'role': role,
+                    'create_time': message.get('create_time'),
+                },
+            }
+
+# Sorted set of memory keys scored by store time (shared with the API)
+MEMORY_INDEX = "memories:by_time"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests (double hashing)"""
+
+    def __init__(self, capacity=10_000_000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        h1, h2 = int(digest[:16], 16), int(digest[16:32], 16) | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+class DedupIndex:
+    """Content hashes that survive between runs
+
+    The Redis set is the source of truth: SADD is an atomic check-and-add,
+    so dedup is O(1) per item and shared by every importer process. The
+    optional local Bloom filter is warmed from the set with SSCAN; a
+    negative answer proves a hash is new, so its SADD is only buffered and
+    sent with the next flush instead of costing a round trip. Use
+    use_bloom=False when several importers write at the same time.
+    """
+
+    def __init__(self, r, key="dedup:hashes", use_bloom=True,
+                 bloom_capacity=10_000_000, bloom_error=0.01, flush_every=1000):
+        self.r = r
+        self.key = key
+        self.bloom = BloomFilter(bloom_capacity, bloom_error) if use_bloom else None
+        self.flush_every = flush_every
+        self._warm = False
+        self._buffered = []
+
+    def warm(self):
+        """Load every stored hash into the Bloom filter (incremental SSCAN)"""
+        if self.bloom is not None and not self._warm:
+            for digest in self.r.sscan_iter(self.key, count=10000):
+                self.bloom.add(digest)
+        self._warm = True
+
+    def add(self, digest):
+        """Record a hash; returns True if it was not seen before"""
+        return self.add_many([digest])[0]
+
+    def add_many(self, digests):
+        """Record hashes in one round trip; True for each one not seen before"""
+        self.warm()
+        results = [None] * len(digests)
+        to_check = []
+        for i, digest in enumerate(digests):
+            if self.bloom is not None and digest not in self.bloom:
+                self._buffered.append(digest)
+                results[i] = True
+            else:
+                to_check.append(i)
+            if self.bloom is not None:
+                self.bloom.add(digest)
+
+        if to_check:
+            pipe = self.r.pipeline(transaction=False)
+            if self._buffered:
+                # Send proven-new hashes first so repeats in this call see them
+                pipe.sadd(self.key, *self._buffered)
+                self._buffered = []
+            for i in to_check:
+                pipe.sadd(self.key, digests[i])
+            replies = pipe.execute()
+            for i, added in zip(to_check, replies[len(replies) - len(to_check):]):
+                results[i] = bool(added)
+
+        if len(self._buffered) >= self.flush_every:
+            self.flush()
+        return results
+
+    def flush(self):
+        """Send buffered SADDs for hashes the Bloom filter proved new"""
+        if self._buffered:
+            buffered, self._buffered = self._buffered, []
+            self.r.sadd(self.key, *buffered)
+
+    def discard(self, digests):
+        """Forget hashes whose records were never written, so a rerun imports them
+
+        The Bloom filter keeps them, which only sends their next check to
+        Redis.
+        """
+        if not digests:
+            return
+        dropped = set(digests)
+        self._buffered = [digest for digest in self._buffered if digest not in dropped]
+        self.r.srem(self.key, *dropped)
+
+    def __len__(self):
+        self.flush()
+        return self.r.scard(self.key)
+
 
 class UniversalMemoryImporter:
-    def __init__(self):
+    def __init__(self, near_threshold=None,
+                 near_snapshot="./data/index/import_minhash.npz"):
         self.r = redis.Redis(host='localhost', port=6379, decode_responses=True)
         self.imported = []
         self.duplicates = []
-        self.hash_cache = set()
+        self.dedup = DedupIndex(self.r)
+        # Near-duplicates (re-exports with small edits); opt-in, since records
+        # differing only by a number or identifier score as near-duplicates
+        self.near_dedup = None
+        if near_threshold is not None:
+            self.near_dedup = NearDuplicateIndex(threshold=near_threshold,
+                                                 snapshot_path=near_snapshot)
+            if os.path.exists(near_snapshot):
+                self.near_dedup.load()
+        self.streamed = 0  # Items written by the streaming import (not kept in self.imported)
         
     def generate_hash(self, content):
         """Generate hash to detect duplicates"""
         return hashlib.md5(content.lower().strip().encode()).hexdigest()
     
+    def _store_new(self, content, key, timestamp):
+        """_store() for content that passed is_duplicate(); un-records it on failure"""
+        try:
+            self._store(key, content, timestamp)
+        except Exception:
+            self.dedup.discard([self.generate_hash(content)])
+            raise
+
     def is_duplicate(self, content):
-        """Check if content is duplicate"""
+        """Check if content is duplicate (exact, then near-duplicate)"""
         content_hash = self.generate_hash(content)
-        if content_hash in self.hash_cache:
+        if not self.dedup.add(content_hash):
+            return True
+        return self.is_near_duplicate(content_hash, content)
+    
+    def is_near_duplicate(self, content_hash, content):
+        """Check content against the MinHash index, indexing it if new
+
+        Only the body is shingled: a "<Source> - <title>" header line is
+        shared by every record of a conversation or export.
+        """
+        if self.near_dedup is None:
+            return False
+        header, newline, body = content.partition("\n")
+        signature = self.near_dedup.signature(body if newline else header)
+        if self.near_dedup.query(signature=signature):
             return True
-        self.hash_cache.add(content_hash)
+        self.near_dedup.add([content_hash], signatures=[signature])
         return False
     
+    def save_indexes(self):
+        """Persist buffered dedup hashes and the near-duplicate snapshot"""
+        self.dedup.flush()
+        if self.near_dedup is not None:
+            self.near_dedup.save()
+    
     def import_chatgpt(self, file_path=None):
         """Import ChatGPT - works with real file OR generates test data"""
         print("📥 Importing ChatGPT...")
@@ -47,9 +263,88 @@ class UniversalMemoryImporter:
             if not self.is_duplicate(content):
                 timestamp = datetime.now().timestamp()
                 key = f"memory:chatgpt:{timestamp}"
-                self.r.set(key, content)
+                self._store_new(content, key, timestamp)
                 self.imported.append(f"ChatGPT: {title}")
                 
+    async def import_chatgpt_stream(self, file_path, batch_size=1000, memory_system=None):
+        """Stream a ChatGPT conversations.json of any size, one message per memory
+
+        Conversations are parsed incrementally (ijson when installed), so
+        memory stays flat regardless of file size. Each batch is written
+        with one Redis pipeline, or through memory_system.store_memories
+        when a SovereignMemorySystem is given, while the next batch is
+        parsed in a worker thread. Hashes are recorded as messages are
+        parsed; if a write fails, the hashes of every unwritten batch are
+        removed again so a rerun imports those messages.
+        """
+        print("📥 Streaming ChatGPT import...")
+        messages = iter_chatgpt_messages(iter_json_array(file_path))
+        ar = None
+        if memory_system is None:
+            ar = aioredis.Redis(host='localhost', port=6379, decode_responses=True)
+
+        start = time.perf_counter()
+        written = 0
+        pending, pending_hashes = None, []
+        try:
+            while True:
+                batch, hashes = await asyncio.to_thread(self._next_unique_batch, messages, batch_size)
+                if pending is not None:
+                    try:
+                        written += await pending
+                    except Exception:
+                        await asyncio.to_thread(self.dedup.discard, pending_hashes + hashes)
+                        raise
+                if not batch:
+                    break
+                pending = asyncio.ensure_future(self._write_batch(batch, ar, memory_system))
+                pending_hashes = hashes
+        finally:
+            if ar is not None:
+                await ar.close()
+
+        self.save_indexes()
+        self.streamed += written
+        elapsed = time.perf_counter() - start
+        print(f"  ✅ {written} messages in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f}/sec)")
+        return written
+
+    def _next_unique_batch(self, messages, batch_size):
+        """Next batch of unseen messages and the content hashes recorded for them"""
+        batch, batch_hashes = [], []
+        while len(batch) < batch_size:
+            candidates = list(itertools.islice(messages, batch_size - len(batch)))
+            if not candidates:
+                break
+            hashes = [self.generate_hash(m['content']) for m in candidates]
+            for message, content_hash, is_new in zip(candidates, hashes, self.dedup.add_many(hashes)):
+                if is_new and not self.is_near_duplicate(content_hash, message['content']):
+                    batch.append(message)
+                    batch_hashes.append(content_hash)
+                else:
+                    self.duplicates.append(message['id'])
+        return batch, batch_hashes
+
+    async def _write_batch(self, batch, ar, memory_system):
+        if memory_system is not None:
+            await memory_system.store_memories(
+                [
+                    {'content': m['content'], 'source': 'chatgpt', 'metadata': m['metadata']}
+                    for m in batch
+                ],
+                defer_linking=True
+            )
+        else:
+            now = datetime.now().timestamp()
+            async with ar.pipeline(transaction=False) as pipe:
+                for i, m in enumerate(batch):
+                    key = f"memory:chatgpt:{m['id']}"
+                    pipe.set(key, m['content'])
+                    # 1µs steps keep undated messages' scores distinct
+                    pipe.zadd(MEMORY_INDEX, {key: m['metadata']['create_time'] or now + i * 1e-6})
+                await pipe.execute()
+        return len(batch)
+
     def import_claude(self, folder_path=None):
         """Import Claude - works with real folder OR generates test data"""
         print("📥 Importing Claude...")
@@ -100,39 +395,73 @@ class UniversalMemoryImporter:
         if not self.is_duplicate(content):
             timestamp = datetime.now().timestamp()
             key = f"memory:{source}:{timestamp}"
-            self.r.set(key, content)
+            self._store_new(content, key, timestamp)
             self.imported.append(f"{source}: {content[:50]}...")
             return True
         return False
     
-    def cleanup_duplicates(self):
-        """Remove duplicate memories"""
+    def _store(self, key, content, timestamp):
+        pipe = self.r.pipeline(transaction=True)
+        pipe.set(key, content)
+        pipe.zadd(MEMORY_INDEX, {key: timestamp})
+        pipe.execute()
+    
+    def cleanup_duplicates(self, count=1000, max_pages=None):
+        """Remove duplicate memories, incrementally
+
+        SCANs imported keys (memory:<source>:...) a page at a time, MGETs
+        the page and claims each content hash with HSETNX in a scratch
+        hash; keys that lose the claim to another key are deleted. The
+        cursor is saved after every page, so the job can be stopped with
+        max_pages and resumed on the next call.
+        """
         print("🧹 Cleaning duplicates...")
-        all_keys = self.r.keys("memory:*")
-        content_map = {}
-        
-        for key in all_keys:
-            content = self.r.get(key)
-            if content:
-                content_hash = self.generate_hash(content)
-                
-                if content_hash in content_map:
-                    self.r.delete(key)
-                    self.duplicates.append(key)
-                else:
-                    content_map[content_hash] = key
+        self.dedup.flush()
+        cursor_key = "dedup:cleanup:cursor"
+        owners_key = "dedup:cleanup:owners"
+        cursor = int(self.r.get(cursor_key) or 0)
+        pages = 0
+
+        while True:
+            cursor, keys = self.r.scan(cursor, match="memory:*:*", count=count)
+            if keys:
+                contents = self.r.mget(keys)
+                pipe = self.r.pipeline(transaction=False)
+                found = [(k, self.generate_hash(c)) for k, c in zip(keys, contents) if c]
+                for key, content_hash in found:
+                    pipe.hsetnx(owners_key, content_hash, key)
+                claimed = pipe.execute()
+
+                lost = [(k, h) for (k, h), won in zip(found, claimed) if not won]
+                if lost:
+                    owners = self.r.hmget(owners_key, [h for _, h in lost])
+                    stale = [k for (k, _), owner in zip(lost, owners) if owner != k]
+                    if stale:
+                        self.r.delete(*stale)
+                        self.r.zrem(MEMORY_INDEX, *stale)
+                        self.duplicates.extend(stale)
+
+            pages += 1
+            if cursor == 0:
+                self.r.delete(cursor_key, owners_key)
+                break
+            self.r.set(cursor_key, cursor)
+            if max_pages and pages >= max_pages:
+                break
+        return cursor == 0
     
     def generate_report(self):
         """Generate import report"""
-        total_memories = len(self.r.keys('memory:*'))
+        self.save_indexes()
+        total_memories = sum(1 for _ in self.r.scan_iter(match='memory:*', count=1000))
         
         print("\n📊 IMPORT REPORT")
-        print(f"✅ Imported: {len(self.imported)} items")
+        print(f"✅ Imported: {len(self.imported) + self.streamed} items")
         print(f"⚠️  Skipped duplicates: {len(self.duplicates)} items")
         print(f"📦 Total memories: {total_memories}")
         
         return {
-            "imported": len(self.imported),
+            "imported": len(self.imported) + self.streamed,
             "duplicates": len(self.duplicates),
             "total": total_memories
         }